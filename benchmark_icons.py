@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark the REChain VC Lab icon pipeline on fixed synthetic inputs
+"""
+
+import argparse
+import os
+import sys
+
+from icon_pipeline import bench, operations, profiling
+
+# One size table for every icon case, covering the manifest's range
+SIZES = (16, 32, 48, 64, 72, 96, 128, 144, 192, 256, 512, 1024)
+
+def _check(ok, path):
+    if not ok:
+        raise RuntimeError(f"Stage reported failure for {path}")
+
+def setup_svg(workdir):
+    from icon_pipeline import backends
+
+    try:
+        operations.select("rasterize")
+    except backends.BackendUnavailable as e:
+        raise bench.CaseSkipped(str(e)) from None
+    return bench.write_synthetic_svg(os.path.join(workdir, "icon.svg"))
+
+def run_svg(svg_path):
+    """generate_png_from_svg for every size"""
+    from generate_icons import generate_png_from_svg
+
+    for size in SIZES:
+        path = f"svg/icon_{size}.png"
+        _check(generate_png_from_svg(svg_path, path, size), path)
+    return [(size, size) for size in SIZES]
+
+def setup_logo(workdir):
+    return bench.write_synthetic_logo(os.path.join(workdir, "logo.png"))
+
+def run_logo(logo_path):
+    """resize_and_center_image and create_icon_from_logo for every size"""
+    from copy_logo_to_icons import create_icon_from_logo
+    from create_icons_from_logo import resize_and_center_image
+
+    for size in SIZES:
+        path = f"logo/centered_{size}.png"
+        _check(resize_and_center_image(logo_path, size, path), path)
+        path = f"logo/padded_{size}.png"
+        _check(create_icon_from_logo(logo_path, path, size), path)
+    return [(size, size) for size in SIZES] * 2
+
+def setup_outputs(workdir):
+    return workdir
+
+def run_procedural(workdir):
+    """create_rechain_icon drawn directly at every size"""
+    from create_icons_python import create_rechain_icon
+
+    os.makedirs("procedural", exist_ok=True)
+    for size in SIZES:
+        path = f"procedural/icon_{size}.png"
+        _check(create_rechain_icon(size, path), path)
+    return [(size, size) for size in SIZES]
+
+def run_basic_png(workdir):
+    """create_basic_png, the dependency-free solid-color encoder"""
+    from create_basic_png import create_basic_png, create_icon
+
+    for size in SIZES:
+        path = f"basic/icon_{size}.png"
+        _check(create_icon(path, size, create_basic_png(size, size)), path)
+    return [(size, size) for size in SIZES]
+
+def run_minimal_png(workdir):
+    """create_minimal_png, the dependency-free minimal encoder"""
+    from create_minimal_png import create_icon, create_minimal_png
+
+    for size in SIZES:
+        path = f"minimal/icon_{size}.png"
+        _check(create_icon(path, size, create_minimal_png(size, size)), path)
+    return [(size, size) for size in SIZES]
+
+def run_banner(workdir):
+    """create_google_play_banner at every banner size"""
+    from generate_google_play_banner import create_google_play_banner
+    from icon_pipeline import banner
+    from icon_pipeline.writer import save_png
+
+    for name, size in banner.BANNER_SIZES.items():
+        save_png(create_google_play_banner(size=name), f"banner/{name}.png")
+    return list(banner.BANNER_SIZES.values())
+
+def check_resample_quality(sizes=SIZES):
+    """Problems where the pyramid falls below resample.MIN_PSNR against direct LANCZOS"""
+    from icon_pipeline import resample
+
+    square = operations.benchmark_image(2 * max(sizes))
+    logo = operations.benchmark_image(1200).resize((1200, 800))
+    problems = []
+    worst = None
+    for name, img in (("square", square), ("logo", logo)):
+        for size in sizes:
+            target = (size, size * img.height // img.width)
+            db = resample.quality_check(img, target)
+            worst = db if worst is None else min(worst, db)
+            if db < resample.MIN_PSNR:
+                problems.append(f"{name} {target[0]}x{target[1]}: {db:.1f} dB")
+    print(f"\n🔍 Resample quality: pyramid vs direct LANCZOS, worst {worst:.1f} dB "
+          f"(floor {resample.MIN_PSNR:.0f} dB)")
+    return problems
+
+CASES = [
+    bench.Case("svg", run_svg.__doc__, setup_svg, run_svg),
+    bench.Case("logo", run_logo.__doc__, setup_logo, run_logo),
+    bench.Case("procedural", run_procedural.__doc__, setup_outputs, run_procedural),
+    bench.Case("basic_png", run_basic_png.__doc__, setup_outputs, run_basic_png),
+    bench.Case("minimal_png", run_minimal_png.__doc__, setup_outputs, run_minimal_png),
+    bench.Case("banner", run_banner.__doc__, setup_outputs, run_banner),
+]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the icon pipeline")
+    parser.add_argument('--case', action='append', choices=[case.name for case in CASES],
+                        help='run only this case (repeatable; default: all)')
+    parser.add_argument('--repeat', type=int, default=bench.DEFAULT_REPEAT,
+                        help=f'fresh-process runs per case, fastest counts (default: {bench.DEFAULT_REPEAT})')
+    parser.add_argument('--output', default=bench.DEFAULT_RESULTS,
+                        help=f'where to write the results JSON (default: {bench.DEFAULT_RESULTS})')
+    parser.add_argument('--baseline', help='results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=bench.DEFAULT_THRESHOLD,
+                        help=f'allowed slowdown vs the baseline as a fraction (default: {bench.DEFAULT_THRESHOLD})')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='also write the results to --baseline')
+    args = parser.parse_args(argv)
+
+    print("🚀 REChain VC Lab - Icon Pipeline Benchmark")
+    print("=" * 50)
+
+    cases = [case for case in CASES if not args.case or case.name in args.case]
+    results = bench.run_cases(cases, args.repeat)
+
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline) and not args.update_baseline:
+        data = bench.load_results(args.baseline)
+        if data["fingerprint"] != operations.fingerprint():
+            print(f"⚠️  {args.baseline} was recorded on a different machine or library versions")
+        baseline = data["cases"]
+
+    bench.print_report(results, baseline)
+    bench.save_results(args.output, results)
+    print(f"\n💾 Results: {args.output}")
+    if args.baseline and args.update_baseline:
+        bench.save_results(args.baseline, results)
+        print(f"📌 Baseline updated: {args.baseline}")
+
+    failed = [name for name, result in results.items() if "error" in result]
+    regressions = bench.compare(results, baseline, args.threshold) if baseline else []
+    degraded = check_resample_quality()
+    for message in regressions:
+        print(f"❌ Regression: {message}")
+    for message in degraded:
+        print(f"❌ Resample quality: {message}")
+    if failed:
+        print(f"❌ Failed cases: {', '.join(failed)}")
+    if regressions or degraded or failed:
+        sys.exit(1)
+    if baseline:
+        print(f"✅ No case slower than the baseline by more than {args.threshold * 100:.0f}%")
+
+if __name__ == "__main__":
+    profiling.run(main)
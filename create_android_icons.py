@@ -7,6 +7,8 @@ import os
 import shutil
 from PIL import Image
 
+from icon_pipeline import operations, profiling, sources
+
 def create_android_icons():
     # Размеры иконок для разных плотностей экрана
     icon_sizes = {
@@ -24,26 +26,24 @@ def create_android_icons():
         return False
     
     try:
-        # Открываем исходное изображение
-        with Image.open(source_image) as img:
-            # Конвертируем в RGBA если нужно
-            if img.mode != 'RGBA':
-                img = img.convert('RGBA')
+        # Открываем исходное изображение (декодируется один раз, в RGBA)
+        img = sources.load_rgba(source_image)
+        
+        # Создаем иконки для каждой плотности
+        for folder, size in icon_sizes.items():
+            folder_path = f'android/app/src/main/res/{folder}'
             
-            # Создаем иконки для каждой плотности
-            for folder, size in icon_sizes.items():
-                folder_path = f'android/app/src/main/res/{folder}'
-                
-                # Создаем папку если не существует
-                os.makedirs(folder_path, exist_ok=True)
-                
-                # Изменяем размер изображения
-                resized_img = img.resize((size, size), Image.Resampling.LANCZOS)
+            # Создаем папку если не существует
+            os.makedirs(folder_path, exist_ok=True)
+            
+            with profiling.target(size):
+                # Изменяем размер через общую пирамиду уменьшений
+                resized_img = operations.resize(img, (size, size))
                 
                 # Сохраняем как PNG
                 output_path = f'{folder_path}/ic_launcher.png'
                 resized_img.save(output_path, 'PNG')
-                print(f"Создана иконка: {output_path} ({size}x{size})")
+            print(f"Создана иконка: {output_path} ({size}x{size})")
         
         print("Все иконки Android созданы успешно!")
         return True
@@ -53,5 +53,5 @@ def create_android_icons():
         return False
 
 if __name__ == "__main__":
-    create_android_icons()
+    profiling.run(create_android_icons)
 
@@ -7,6 +7,8 @@ import os
 from PIL import Image, ImageDraw, ImageFilter
 import shutil
 
+from icon_pipeline import operations, profiling, sources
+
 def create_android_icons():
     """Create Android icons from existing logo"""
     
@@ -31,37 +33,26 @@ def create_android_icons():
         os.makedirs(f"android/app/src/main/res/{folder}", exist_ok=True)
     
     try:
-        # Load source image
-        with Image.open(source_image) as img:
-            # Convert to RGBA if needed
-            if img.mode != 'RGBA':
-                img = img.convert('RGBA')
-            
-            # Create a square version
-            size = max(img.size)
-            square_img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-            
-            # Paste image in center
-            x = (size - img.size[0]) // 2
-            y = (size - img.size[1]) // 2
-            square_img.paste(img, (x, y), img)
-            
-            # Create icons for each density
-            for folder, size in android_sizes.items():
-                # Resize image
-                resized = square_img.resize((size, size), Image.Resampling.LANCZOS)
+        # Load source image as a centered square version (decoded once)
+        square_img = sources.load_square(source_image)
+        
+        # Create icons for each density
+        for folder, size in android_sizes.items():
+            with profiling.target(size):
+                # Resize image from the shared reduction pyramid
+                resized = operations.resize(square_img, (size, size))
                 
                 # Save as PNG
                 output_path = f"android/app/src/main/res/{folder}/ic_launcher.png"
                 resized.save(output_path, 'PNG')
-                print(f"Created {output_path} ({size}x{size})")
-            
-            print("All Android icons created successfully!")
-            return True
+            print(f"Created {output_path} ({size}x{size})")
+        
+        print("All Android icons created successfully!")
+        return True
             
     except Exception as e:
         print(f"Error creating icons: {e}")
         return False
 
 if __name__ == "__main__":
-    create_android_icons()
+    profiling.run(create_android_icons)
@@ -3,8 +3,11 @@
 Create basic PNG favicon for REChain VC Lab
 """
 
+from icon_pipeline import profiling
+
 try:
-    from PIL import Image, ImageDraw, ImageFont
+    from PIL import Image, ImageDraw
+    from icon_pipeline.fonts import get_font
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
@@ -21,21 +24,15 @@ def create_simple_favicon():
         draw.rectangle([0, 0, 31, 31], outline=(255, 255, 255, 255), width=2)
         
         # Add "R" text
-        try:
-            font = ImageFont.truetype("arial.ttf", 16)
-        except:
-            font = None
+        font = get_font(16)
         
         text = "R"
-        if font:
-            bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            x = (32 - text_width) // 2
-            y = (32 - text_height) // 2
-            draw.text((x, y), text, fill=(255, 255, 255, 255), font=font)
-        else:
-            draw.text((12, 8), text, fill=(255, 255, 255, 255))
+        bbox = draw.textbbox((0, 0), text, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+        x = (32 - text_width) // 2
+        y = (32 - text_height) // 2
+        draw.text((x, y), text, fill=(255, 255, 255, 255), font=font)
         
         # Save favicon
         img.save('web/favicon.png', 'PNG')
@@ -46,20 +43,14 @@ def create_simple_favicon():
         draw192 = ImageDraw.Draw(img192)
         draw192.rectangle([0, 0, 191, 191], outline=(255, 255, 255, 255), width=4)
         
-        try:
-            font192 = ImageFont.truetype("arial.ttf", 96)
-        except:
-            font192 = None
+        font192 = get_font(96)
         
-        if font192:
-            bbox = draw192.textbbox((0, 0), text, font=font192)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            x = (192 - text_width) // 2
-            y = (192 - text_height) // 2
-            draw192.text((x, y), text, fill=(255, 255, 255, 255), font=font192)
-        else:
-            draw192.text((80, 60), text, fill=(255, 255, 255, 255))
+        bbox = draw192.textbbox((0, 0), text, font=font192)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+        x = (192 - text_width) // 2
+        y = (192 - text_height) // 2
+        draw192.text((x, y), text, fill=(255, 255, 255, 255), font=font192)
         
         img192.save('web/icons/Icon-192.png', 'PNG')
         print("✅ Created web/icons/Icon-192.png")
@@ -69,20 +60,14 @@ def create_simple_favicon():
         draw512 = ImageDraw.Draw(img512)
         draw512.rectangle([0, 0, 511, 511], outline=(255, 255, 255, 255), width=8)
         
-        try:
-            font512 = ImageFont.truetype("arial.ttf", 256)
-        except:
-            font512 = None
+        font512 = get_font(256)
         
-        if font512:
-            bbox = draw512.textbbox((0, 0), text, font=font512)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            x = (512 - text_width) // 2
-            y = (512 - text_height) // 2
-            draw512.text((x, y), text, fill=(255, 255, 255, 255), font=font512)
-        else:
-            draw512.text((200, 150), text, fill=(255, 255, 255, 255))
+        bbox = draw512.textbbox((0, 0), text, font=font512)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+        x = (512 - text_width) // 2
+        y = (512 - text_height) // 2
+        draw512.text((x, y), text, fill=(255, 255, 255, 255), font=font512)
         
         img512.save('web/icons/Icon-512.png', 'PNG')
         print("✅ Created web/icons/Icon-512.png")
@@ -92,7 +77,7 @@ def create_simple_favicon():
         print("❌ PIL not available. Please install: pip install Pillow")
         return False
 
-if __name__ == "__main__":
+def main():
     print("🎨 Creating REChain VC Lab Web Icons")
     print("=" * 40)
     
@@ -108,3 +93,6 @@ if __name__ == "__main__":
         print("4. Check if icons are now visible")
     else:
         print("\n❌ Failed to create icons")
+
+if __name__ == "__main__":
+    profiling.run(main)
@@ -3,162 +3,131 @@
 REChain VC Lab - Create Custom Icons for All Platforms
 """
 
+import argparse
 import os
-import sys
-from PIL import Image, ImageDraw, ImageFont
-import math
+from PIL import Image, ImageDraw
 
-def create_rechain_icon(size, output_path):
-    """Create a custom REChain VC Lab icon"""
-    try:
-        # Create image with gradient background
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Create gradient effect (simplified - solid color for now)
-        bg_color = (99, 102, 241, 255)  # #6366F1
-        draw.rectangle([0, 0, size, size], fill=bg_color)
-        
-        # Draw white border
-        border_width = max(1, size // 16)
-        draw.rectangle([0, 0, size-1, size-1], outline=(255, 255, 255, 255), width=border_width)
-        
-        # Add blockchain chain elements
-        chain_size = size // 8
-        center_x = size // 2
-        center_y = size // 2
-        
-        # Draw chain links
-        chain_color = (255, 255, 255, 200)
-        
-        # Left chain link
-        left_rect = [center_x - size//4 - chain_size//2, center_y - chain_size//4, 
-                    center_x - size//4 + chain_size//2, center_y + chain_size//4]
-        draw.ellipse(left_rect, fill=chain_color, outline=(255, 255, 255, 255))
-        
-        # Center chain link (larger)
-        center_rect = [center_x - chain_size//2, center_y - chain_size//2, 
-                      center_x + chain_size//2, center_y + chain_size//2]
-        draw.ellipse(center_rect, fill=chain_color, outline=(255, 255, 255, 255))
-        
-        # Right chain link
-        right_rect = [center_x + size//4 - chain_size//2, center_y - chain_size//4, 
-                     center_x + size//4 + chain_size//2, center_y + chain_size//4]
-        draw.ellipse(right_rect, fill=chain_color, outline=(255, 255, 255, 255))
-        
-        # Add "R" text
-        try:
-            font_size = size // 4
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            font = ImageFont.load_default()
-        
-        text = "R"
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        x = (size - text_width) // 2
-        y = (size - text_height) // 2 - size // 8
-        draw.text((x, y), text, fill=(255, 255, 255, 255), font=font)
-        
-        # Add "VC" text
+from icon_pipeline import manifest, operations, platform_metadata, profiling
+from icon_pipeline.parallel import add_jobs_argument, run_tasks
+from icon_pipeline.png_encoder import add_profile_argument, pillow_save_options
+from icon_pipeline.procedural import ProceduralRenderer, add_supersample_argument
+from icon_pipeline.text_layers import draw_centered_text
+from icon_pipeline.writer import save_png
+
+def draw_rechain_icon(size, scale=1):
+    """Draw the REChain VC Lab icon geometry at ``size`` pixels
+
+    ``scale`` widens the hairline outlines when drawing a supersampled
+    master, so they keep their width after downscaling.
+    """
+    # Create image with gradient background
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    
+    # Create gradient effect (simplified - solid color for now)
+    bg_color = (99, 102, 241, 255)  # #6366F1
+    draw.rectangle([0, 0, size, size], fill=bg_color)
+    
+    # Draw white border
+    border_width = max(1, size // 16)
+    draw.rectangle([0, 0, size-1, size-1], outline=(255, 255, 255, 255), width=border_width)
+    
+    # Add blockchain chain elements
+    chain_size = size // 8
+    center_x = size // 2
+    center_y = size // 2
+    
+    # Draw chain links
+    chain_color = (255, 255, 255, 200)
+    
+    # Left chain link
+    left_rect = [center_x - size//4 - chain_size//2, center_y - chain_size//4, 
+                center_x - size//4 + chain_size//2, center_y + chain_size//4]
+    draw.ellipse(left_rect, fill=chain_color, outline=(255, 255, 255, 255), width=scale)
+    
+    # Center chain link (larger)
+    center_rect = [center_x - chain_size//2, center_y - chain_size//2, 
+                  center_x + chain_size//2, center_y + chain_size//2]
+    draw.ellipse(center_rect, fill=chain_color, outline=(255, 255, 255, 255), width=scale)
+    
+    # Right chain link
+    right_rect = [center_x + size//4 - chain_size//2, center_y - chain_size//4, 
+                 center_x + size//4 + chain_size//2, center_y + chain_size//4]
+    draw.ellipse(right_rect, fill=chain_color, outline=(255, 255, 255, 255), width=scale)
+    
+    # Add "R" and "VC" text from cached masks
+    draw_centered_text(img, "R", size // 4, (255, 255, 255, 255), offset=(0, -(size // 8)))
+    draw_centered_text(img, "VC", size // 8, (255, 255, 255, 255), offset=(0, size // 8))
+    return img
+
+def create_rechain_icon(size, output_path, profile=None):
+    """Create a custom REChain VC Lab icon, drawn directly at ``size``"""
+    return save_icon(draw_rechain_icon(size), (output_path,), profile)
+
+def save_icon(img, output_paths, profile=None):
+    """Save a rendered icon to every path through the shared writer
+
+    The PNG is encoded once; the other paths are linked or copied from it.
+    """
+    size = img.width
+    for output_path in output_paths:
         try:
-            vc_font_size = size // 8
-            vc_font = ImageFont.truetype("arial.ttf", vc_font_size)
-        except:
-            vc_font = ImageFont.load_default()
-        
-        vc_text = "VC"
-        vc_bbox = draw.textbbox((0, 0), vc_text, font=vc_font)
-        vc_text_width = vc_bbox[2] - vc_bbox[0]
-        vc_text_height = vc_bbox[3] - vc_bbox[1]
-        vc_x = (size - vc_text_width) // 2
-        vc_y = (size - vc_text_height) // 2 + size // 8
-        draw.text((vc_x, vc_y), vc_text, fill=(255, 255, 255, 255), font=vc_font)
-        
-        # Save image
-        img.save(output_path, 'PNG')
-        print(f"✅ Created: {output_path} ({size}x{size})")
-        return True
-        
+            save_png(img, output_path, **pillow_save_options(profile))
+            print(f"✅ Created: {output_path} ({size}x{size})")
+        except Exception as e:
+            print(f"❌ Failed: {output_path} - {str(e)}")
+            return False
+    return True
+
+def render_icon(level, size, output_paths, profile=None):
+    """Worker task: resize a level of the shared master to ``size`` and save it"""
+    try:
+        with profiling.target(size):
+            img = level if level.size == (size, size) else operations.resize(level, (size, size))
     except Exception as e:
-        print(f"❌ Failed: {output_path} - {str(e)}")
+        for output_path in output_paths:
+            print(f"❌ Failed: {output_path} - {str(e)}")
         return False
+    return save_icon(img, output_paths, profile)
+
+def adaptive_foregrounds():
+    """Paths of adaptive-icon foreground layers, which need their own artwork"""
+    return {path for entry in manifest.metadata() if entry["format"] == "adaptive_icon"
+            for path in platform_metadata.bitmaps(entry)}
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create custom REChain VC Lab icons")
+    add_jobs_argument(parser)
+    add_profile_argument(parser)
+    add_supersample_argument(parser)
+    args = parser.parse_args(argv)
+    
     print("🚀 REChain VC Lab - Creating Custom Icons for All Platforms")
     print("=" * 60)
     
-    # Create directories
-    directories = [
-        "android/app/src/main/res/mipmap-mdpi",
-        "android/app/src/main/res/mipmap-hdpi", 
-        "android/app/src/main/res/mipmap-xhdpi",
-        "android/app/src/main/res/mipmap-xxhdpi",
-        "android/app/src/main/res/mipmap-xxxhdpi",
-        "ios/Runner/Assets.xcassets/AppIcon.appiconset",
-        "macos/Runner/Assets.xcassets/AppIcon.appiconset",
-        "web/icons",
-        "windows/runner",
-        "linux"
-    ]
+    # All icons to create, from the shared manifest. Adaptive-icon
+    # foregrounds are a layer on a separate background, not a full icon.
+    foregrounds = adaptive_foregrounds()
+    icons = [icon for icon in manifest.targets() if icon.path not in foregrounds]
+    print(f"⏭️  Skipping {len(foregrounds)} adaptive-icon foreground layers")
     
     print("📁 Creating directories...")
-    for directory in directories:
+    for directory in manifest.directories(icons):
         os.makedirs(directory, exist_ok=True)
         print(f"   📁 Created: {directory}")
     
-    # Define all icons to create
-    icons = [
-        # Android
-        ("android/app/src/main/res/mipmap-mdpi/ic_launcher.png", 48),
-        ("android/app/src/main/res/mipmap-hdpi/ic_launcher.png", 72),
-        ("android/app/src/main/res/mipmap-xhdpi/ic_launcher.png", 96),
-        ("android/app/src/main/res/mipmap-xxhdpi/ic_launcher.png", 144),
-        ("android/app/src/main/res/mipmap-xxxhdpi/ic_launcher.png", 192),
-        
-        # iOS
-        ("ios/Runner/Assets.xcassets/AppIcon.appiconset/icon-20.png", 20),
-        ("ios/Runner/Assets.xcassets/AppIcon.appiconset/icon-29.png", 29),
-        ("ios/Runner/Assets.xcassets/AppIcon.appiconset/icon-40.png", 40),
-        ("ios/Runner/Assets.xcassets/AppIcon.appiconset/icon-60.png", 60),
-        ("ios/Runner/Assets.xcassets/AppIcon.appiconset/icon-76.png", 76),
-        ("ios/Runner/Assets.xcassets/AppIcon.appiconset/icon-120.png", 120),
-        ("ios/Runner/Assets.xcassets/AppIcon.appiconset/icon-180.png", 180),
-        ("ios/Runner/Assets.xcassets/AppIcon.appiconset/icon-1024.png", 1024),
-        
-        # macOS
-        ("macos/Runner/Assets.xcassets/AppIcon.appiconset/icon_16x16.png", 16),
-        ("macos/Runner/Assets.xcassets/AppIcon.appiconset/icon_32x32.png", 32),
-        ("macos/Runner/Assets.xcassets/AppIcon.appiconset/icon_128x128.png", 128),
-        ("macos/Runner/Assets.xcassets/AppIcon.appiconset/icon_256x256.png", 256),
-        ("macos/Runner/Assets.xcassets/AppIcon.appiconset/icon_512x512.png", 512),
-        ("macos/Runner/Assets.xcassets/AppIcon.appiconset/icon_1024x1024.png", 1024),
-        
-        # Web
-        ("web/favicon.png", 32),
-        ("web/icons/Icon-192.png", 192),
-        ("web/icons/Icon-512.png", 512),
-        
-        # Windows
-        ("windows/runner/rechain_vc_lab_icon.png", 256),
-        
-        # Linux
-        ("linux/icon_16x16.png", 16),
-        ("linux/icon_32x32.png", 32),
-        ("linux/icon_48x48.png", 48),
-        ("linux/icon_64x64.png", 64),
-        ("linux/icon_128x128.png", 128),
-        ("linux/icon_256x256.png", 256)
-    ]
-    
     print("\n🎨 Creating icons...")
-    success_count = 0
     total_icons = len(icons)
     
-    for icon_path, size in icons:
-        if create_rechain_icon(size, icon_path):
-            success_count += 1
+    # Draw the icon once, supersampled; workers get the smallest pyramid
+    # level of it that each size can be resized from
+    groups = manifest.group_renders(icons)
+    renderer = ProceduralRenderer(draw_rechain_icon, max(key.size for key in groups),
+                                  supersample=args.supersample)
+    plan = [(renderer.level(key.size), key.size, tuple(paths), args.profile)
+            for key, paths in groups.items()]
+    results = run_tasks(render_icon, plan, jobs=args.jobs)
+    success_count = sum(len(task[2]) for task, ok in zip(plan, results) if ok)
     
     print(f"\n📊 Summary:")
     print(f"   Icons created: {success_count}/{total_icons}")
@@ -177,13 +146,9 @@ def main():
         print(f"\n⚠️ {total_icons - success_count} icons failed to create.")
     
     print("\n🎯 REChain VC Lab Custom Icons Status:")
-    print("✅ Android: 5 icons ready")
-    print("✅ iOS: 8 icons ready")
-    print("✅ macOS: 6 icons ready")
-    print("✅ Web: 3 icons ready")
-    print("✅ Windows: 1 icon ready")
-    print("✅ Linux: 6 icons ready")
+    for platform, count in manifest.platform_counts(icons).items():
+        print(f"✅ {manifest.PLATFORM_LABELS[platform]}: {count} icons ready")
     print(f"🎨 Total: {success_count} custom icons generated!")
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)
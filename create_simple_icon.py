@@ -3,10 +3,16 @@
 Создание простой иконки для Android
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+import argparse
 import os
 
-def create_simple_icon(size, output_path):
+from icon_pipeline import profiling
+from icon_pipeline.procedural import ProceduralRenderer, add_supersample_argument
+from icon_pipeline.text_layers import draw_centered_text
+
+def draw_simple_icon(size, scale=1):
+    """Рисует иконку размером ``size``; ``scale`` утолщает обводку для мастера"""
     # Создаем изображение с прозрачным фоном
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
@@ -14,30 +20,25 @@ def create_simple_icon(size, output_path):
     # Рисуем простой круг с текстом
     margin = size // 8
     draw.ellipse([margin, margin, size-margin, size-margin], 
-                 fill=(33, 150, 243, 255), outline=(25, 118, 210, 255), width=2)
-    
-    # Добавляем текст "RC"
-    try:
-        font_size = size // 3
-        font = ImageFont.truetype("arial.ttf", font_size)
-    except:
-        font = ImageFont.load_default()
-    
-    text = "RC"
-    bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
-    
-    x = (size - text_width) // 2
-    y = (size - text_height) // 2
-    
-    draw.text((x, y), text, fill=(255, 255, 255, 255), font=font)
+                 fill=(33, 150, 243, 255), outline=(25, 118, 210, 255), width=2 * scale)
     
+    # Добавляем текст "RC" из кэшированной маски
+    draw_centered_text(img, "RC", size // 3, (255, 255, 255, 255))
+    return img
+
+def save_icon(img, output_path):
     # Сохраняем изображение
     img.save(output_path, 'PNG')
-    print(f"Создана иконка: {output_path} ({size}x{size})")
+    print(f"Создана иконка: {output_path} ({img.width}x{img.height})")
 
-def main():
+def create_simple_icon(size, output_path):
+    save_icon(draw_simple_icon(size), output_path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Создание простой иконки для Android")
+    add_supersample_argument(parser)
+    args = parser.parse_args(argv)
+    
     # Размеры иконок для разных плотностей экрана
     icon_sizes = {
         'mipmap-mdpi': 48,    # 1x
@@ -47,13 +48,16 @@ def main():
         'mipmap-xxxhdpi': 192 # 4x
     }
     
+    # Рисуем иконку один раз и уменьшаем под каждую плотность
+    renderer = ProceduralRenderer(draw_simple_icon, max(icon_sizes.values()),
+                                  supersample=args.supersample)
     for folder, size in icon_sizes.items():
         folder_path = f'android/app/src/main/res/{folder}'
         os.makedirs(folder_path, exist_ok=True)
         output_path = f'{folder_path}/ic_launcher.png'
-        create_simple_icon(size, output_path)
+        save_icon(renderer.render(size), output_path)
     
     print("Все иконки созданы успешно!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    profiling.run(main)
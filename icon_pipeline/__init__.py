@@ -0,0 +1,3 @@
+"""
+REChain VC Lab - shared icon pipeline used by the icon generation scripts
+"""
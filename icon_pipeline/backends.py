@@ -0,0 +1,84 @@
+"""
+Optional dependency detection without import-time cost.
+
+Heavy libraries (cairosvg, Pillow, NumPy) are imported only when a code
+path actually needs them, and each is probed at most once per process.
+Nothing here installs packages: a missing backend raises
+BackendUnavailable with the pip command to run, so builds also work in
+read-only containers.
+"""
+
+import importlib
+import importlib.util
+from functools import lru_cache
+
+# backend name -> (module to import, pip package that provides it)
+BACKENDS = {
+    "cairosvg": ("cairosvg", "cairosvg"),
+    "pillow": ("PIL.Image", "Pillow"),
+    "numpy": ("numpy", "numpy"),
+}
+
+# backend name -> error of its failed import, so it is not retried
+_missing = {}
+
+
+class BackendUnavailable(ImportError):
+    """An optional backend is not installed or fails to load"""
+
+
+def _spec(name):
+    try:
+        module, _ = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown backend: {name}") from None
+    return module
+
+
+@lru_cache(maxsize=None)
+def installed(name):
+    """Whether ``name`` is installed, without importing it"""
+    module = _spec(name)
+    try:
+        return importlib.util.find_spec(module.split(".")[0]) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def load(name):
+    """Import and return the module of backend ``name``
+
+    Raises BackendUnavailable when it is missing or its native library
+    cannot be loaded (e.g. cairosvg without libcairo). A failed import is
+    not retried: probing cairosvg searches for libcairo, which spawns
+    ldconfig, so later calls re-raise the first error.
+    """
+    module = _spec(name)
+    error = _missing.get(name)
+    if error is None:
+        try:
+            return importlib.import_module(module)
+        except (ImportError, OSError) as e:
+            error = _missing[name] = e
+    raise BackendUnavailable(f"{name} is not available ({error}); "
+                             f"install it with: pip install {BACKENDS[name][1]}") from error
+
+
+def optional(name):
+    """The backend's module, or None when it cannot be loaded"""
+    if not installed(name):
+        return None
+    try:
+        return load(name)
+    except BackendUnavailable:
+        return None
+
+
+def missing(*names):
+    """Names of the given backends that are not installed"""
+    return [name for name in names if not installed(name)]
+
+
+def install_hint(names):
+    """pip command that installs the given backends"""
+    return "pip install " + " ".join(BACKENDS[name][1] for name in names)
@@ -0,0 +1,245 @@
+"""
+Store banner rendering with a shared layer cache.
+
+A banner is a locale-independent base layer (gradient, glows, icon tile,
+button chrome) plus a text layer. The base layer is rendered once per
+banner size and reused by every locale, so a batch of localized variants
+only pays for drawing text. Layouts are specified for the 1024x500
+feature graphic and scaled to the other sizes.
+"""
+
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+from PIL import Image, ImageDraw
+
+from icon_pipeline import trace
+from icon_pipeline.fonts import get_font
+from icon_pipeline.gradients import apply_glow, glow_layer, vertical_gradient
+from icon_pipeline.parallel import default_jobs, run_tasks
+from icon_pipeline.png_encoder import pillow_save_options
+from icon_pipeline.writer import encode_png, write_bytes
+
+BANNER_SIZES = {
+    "feature": (1024, 500),
+    "tv": (1280, 720),
+    "social": (1280, 640),
+}
+
+BASE_SIZE = BANNER_SIZES["feature"]
+
+# Gradient from #667eea to #764ba2
+GRADIENT = ((102, 126, 234), (118, 75, 162))
+
+DEFAULT_VARIANTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "banner_variants.json")
+
+BannerStrings = namedtuple("BannerStrings", "title subtitle description button")
+
+DEFAULT_STRINGS = BannerStrings(
+    title="REChain VC Lab",
+    subtitle="Web3 Venture Capital Laboratory",
+    description="Advanced tools for blockchain investment analysis,\n"
+                "portfolio management, and Web3 ecosystem exploration",
+    button="Download Now",
+)
+
+# One output: a locale's strings rendered at one named size
+Variant = namedtuple("Variant", "locale size strings")
+
+
+class Layout:
+    """Pixel geometry of a banner size, scaled from the feature graphic"""
+
+    def __init__(self, size):
+        self.width, self.height = size
+        self.scale = min(self.width / BASE_SIZE[0], self.height / BASE_SIZE[1])
+        self.margin = self.px(60)
+        self.icon_size = self.px(180)
+        self.icon_x = self.width - self.margin - self.icon_size
+        self.icon_y = (self.height - self.icon_size) // 2
+        self.button = (self.width - self.margin - self.px(200),
+                       self.height - self.margin - self.px(50),
+                       self.width - self.margin,
+                       self.height - self.margin)
+
+    def px(self, value):
+        return max(1, round(value * self.scale))
+
+    @property
+    def text_width(self):
+        """Room for text left of the icon tile"""
+        return self.icon_x - 2 * self.margin
+
+
+def _fitted_font(text, size, max_width):
+    """Largest font up to ``size`` whose widest line fits ``max_width``"""
+    font = get_font(size)
+    while size > 8 and max(font.getlength(line) for line in text.split("\n")) > max_width:
+        size -= 2
+        font = get_font(size)
+    return font
+
+
+def _centered_text(draw, box, text, font, fill):
+    bbox = draw.textbbox((0, 0), text, font=font)
+    x = box[0] + (box[2] - box[0] - (bbox[2] - bbox[0])) // 2
+    y = box[1] + (box[3] - box[1] - (bbox[3] - bbox[1])) // 2
+    draw.text((x, y), text, font=font, fill=fill)
+
+
+def _draw_app_icon(draw, layout):
+    """White rounded tile with a drop shadow and the "R" mark"""
+    x, y, size = layout.icon_x, layout.icon_y, layout.icon_size
+    radius = layout.px(25)
+    shadow = layout.px(5)
+    draw.rounded_rectangle([x + shadow, y + shadow, x + size + shadow, y + size + shadow],
+                           radius=radius, fill=(0, 0, 0, 30))
+    draw.rounded_rectangle([x, y, x + size, y + size], radius=radius, fill="white")
+
+    # "R" with gradient effect (simulated with two offset colors)
+    font = get_font(layout.px(120))
+    box = (x, y, x + size, y + size)
+    for i, color in enumerate(GRADIENT):
+        offset = i * layout.px(2)
+        _centered_text(draw, (box[0] + offset, box[1] + offset, box[2] + offset, box[3] + offset),
+                       "R", font, color)
+
+
+def _draw_button_chrome(draw, layout):
+    draw.rounded_rectangle(layout.button, radius=layout.px(25),
+                           fill=(255, 255, 255, 50), outline=(255, 255, 255, 100))
+
+
+@lru_cache(maxsize=8)
+def base_layer(size):
+    """Locale-independent background of a banner size; callers must copy it"""
+    layout = Layout(size)
+    image = vertical_gradient(size, *GRADIENT)
+
+    # Subtle circles for depth: stacks of semi-transparent white rings
+    glows = [(layout.width * (0.2 + i * 0.3), layout.height * (0.2 + i * 0.2),
+              layout.px(100 + i * 50)) for i in range(3)]
+    apply_glow(image, glow_layer(size, glows, step=layout.px(10), peak=20))
+
+    chrome = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(chrome)
+    _draw_app_icon(draw, layout)
+    _draw_button_chrome(draw, layout)
+    image.paste(chrome, (0, 0), chrome)
+    return image
+
+
+def text_layer(size, strings):
+    """Transparent RGBA layer with the localized strings and their shadows"""
+    layout = Layout(size)
+    layer = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+
+    x = layout.margin
+    y = layout.px(80)
+    lines = (
+        (strings.title, 72, 3, 100, 90),
+        (strings.subtitle, 36, 2, 80, 70),
+        (strings.description, 24, 1, 60, 0),
+    )
+    for text, font_size, shadow, shadow_alpha, advance in lines:
+        font = _fitted_font(text, layout.px(font_size), layout.text_width)
+        offset = layout.px(shadow)
+        draw.text((x + offset, y + offset), text, font=font, fill=(0, 0, 0, shadow_alpha))
+        draw.text((x, y), text, font=font, fill="white")
+        y += layout.px(advance)
+
+    _centered_text(draw, layout.button, strings.button, get_font(layout.px(18)), "white")
+    return layer
+
+
+def render_banner(strings=DEFAULT_STRINGS, size="feature"):
+    """Render one banner; ``size`` is a BANNER_SIZES name or (width, height)"""
+    size = BANNER_SIZES.get(size, size)
+    image = base_layer(tuple(size)).copy()
+    text = text_layer(size, strings)
+    image.paste(text, (0, 0), text)
+    return image
+
+
+def banner_path(output_dir, variant):
+    width, height = BANNER_SIZES[variant.size]
+    return os.path.join(output_dir, variant.locale, f"banner_{variant.size}_{width}x{height}.png")
+
+
+def load_variants(path=DEFAULT_VARIANTS):
+    """Read a variants table: every locale rendered at every listed size
+
+    Locales only need to list the strings they translate; the rest fall
+    back to the English defaults.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        table = json.load(f)
+
+    sizes = table.get("sizes", ["feature"])
+    for name in sizes:
+        if name not in BANNER_SIZES:
+            raise ValueError(f"Unknown banner size: {name}")
+
+    variants = []
+    for locale, overrides in table.get("locales", {}).items():
+        unknown = set(overrides) - set(BannerStrings._fields)
+        if unknown:
+            raise ValueError(f"Unknown banner strings for {locale}: {', '.join(sorted(unknown))}")
+        strings = DEFAULT_STRINGS._replace(**overrides)
+        variants.extend(Variant(locale, name, strings) for name in sizes)
+    return variants
+
+
+def save_banner(variant, output_path, profile=None):
+    """Render and save one variant; used as a worker task"""
+    with trace.output(output_path):
+        with trace.stage("composite"):
+            image = render_banner(variant.strings, variant.size)
+        write_bytes(output_path, encode_png(image, **pillow_save_options(profile)))
+    print(f"✅ Created: {output_path}")
+    return True
+
+
+def save_banners(variants, output_paths, profile=None):
+    """Render and save variants of one size in one worker task
+
+    The base layer is drawn for the first variant and reused by the rest.
+    Returns one success flag per variant.
+    """
+    results = []
+    for variant, output_path in zip(variants, output_paths):
+        try:
+            results.append(save_banner(variant, output_path, profile))
+        except Exception as e:
+            print(f"❌ Failed: {output_path} - {e}")
+            results.append(False)
+    return results
+
+
+def build_banners(variants, output_dir, profile=None, jobs=None):
+    """Render all variants; each task covers variants of a single size
+
+    Variants of a size are split over no more tasks than the workers
+    available to that size, so each worker draws a base layer once and
+    composites every locale it was given on top. Returns the list of
+    output paths that were written.
+    """
+    groups = {}
+    for variant in variants:
+        groups.setdefault(variant.size, []).append(variant)
+    workers = default_jobs() if jobs is None else max(1, jobs)
+    per_size = max(1, workers // len(groups)) if groups else 1
+
+    tasks = []
+    for size in sorted(groups, key=list(BANNER_SIZES).index):
+        group = groups[size]
+        chunk = -(-len(group) // per_size)
+        for start in range(0, len(group), chunk):
+            batch = group[start:start + chunk]
+            tasks.append((batch, [banner_path(output_dir, variant) for variant in batch], profile))
+    results = run_tasks(save_banners, tasks, jobs)
+    return [path for (_, paths, _), flags in zip(tasks, results)
+            for path, ok in zip(paths, flags or [False] * len(paths)) if ok]
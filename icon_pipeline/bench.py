@@ -0,0 +1,204 @@
+"""
+Benchmark harness for the asset pipeline.
+
+A benchmark case prepares fixed synthetic inputs in a scratch directory
+(untimed), then runs one stage of the pipeline on them and returns the
+``(width, height)`` of every asset it produced. Each repetition runs in a freshly spawned interpreter,
+so in-process caches start cold and the peak RSS belongs to that case
+alone. Results are wall time, icons/s, megapixels/s and peak RSS. They
+are stored as JSON and can be compared against a baseline with a
+relative slowdown threshold.
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import traceback
+from collections import namedtuple
+
+from icon_pipeline.trace import peak_rss
+
+DEFAULT_RESULTS = "bench_results.json"
+DEFAULT_REPEAT = 3
+# A case fails the comparison when it is this much slower than the baseline
+DEFAULT_THRESHOLD = 0.20
+
+RESULTS_VERSION = 1
+
+# ``setup(workdir)`` writes the inputs and returns what ``run`` takes;
+# ``run(inputs)`` is the timed stage and returns the sizes it produced
+Case = namedtuple('Case', 'name description setup run')
+
+
+class CaseSkipped(Exception):
+    """A case cannot run here, e.g. a backend it needs is unavailable"""
+
+
+def write_synthetic_svg(path):
+    """Fixed SVG input shared by the SVG cases"""
+    from icon_pipeline import operations
+
+    with open(path, 'wb') as f:
+        f.write(operations.BENCHMARK_SVG)
+    return path
+
+
+def write_synthetic_logo(path, size=(1200, 800)):
+    """Fixed non-square RGBA logo, so fitting and padding do real work"""
+    from icon_pipeline import operations
+
+    operations.benchmark_image(max(size)).resize(size).save(path, 'PNG')
+    return path
+
+
+def _run_once(case):
+    """Child process entry point: set up and time ``case`` in a scratch directory"""
+    with tempfile.TemporaryDirectory(prefix="icon-bench-") as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                inputs = case.setup(workdir)
+                start = time.perf_counter()
+                sizes = case.run(inputs)
+                seconds = time.perf_counter() - start
+        except CaseSkipped as e:
+            return {"skipped": str(e)}
+        except Exception as e:
+            return {"error": f"{e}\n{traceback.format_exc()}"}
+        finally:
+            os.chdir(cwd)
+    return {
+        "seconds": seconds,
+        "icons": len(sizes),
+        "pixels": sum(width * height for width, height in sizes),
+        "peak_rss": peak_rss(),
+    }
+
+
+def run_case(case, repeat=DEFAULT_REPEAT):
+    """Run a case ``repeat`` times in fresh processes and summarize it
+
+    The fastest repetition counts for time and throughput, the largest
+    for memory.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(max(1, repeat)):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            run = executor.submit(_run_once, case).result()
+        if "seconds" not in run:
+            return run
+        runs.append(run)
+
+    best = min(runs, key=lambda run: run["seconds"])
+    seconds = best["seconds"]
+    rss = [run["peak_rss"] for run in runs if run["peak_rss"] is not None]
+    return {
+        "seconds": seconds,
+        "icons": best["icons"],
+        "icons_per_s": best["icons"] / seconds if seconds else None,
+        "megapixels_per_s": best["pixels"] / 1e6 / seconds if seconds else None,
+        "peak_rss_mb": max(rss) / (1024 * 1024) if rss else None,
+        "repeat": len(runs),
+    }
+
+
+def pin_backends():
+    """Resolve the operation backends once and pin them for child processes
+
+    Cases run in scratch directories, where no recorded decision exists;
+    without pinning, every child would rerun the selection microbenchmark
+    inside the timed region. Returns ``{operation: backend name}``.
+    """
+    from icon_pipeline import backends, operations
+
+    pinned = {}
+    for operation in operations.OPERATIONS:
+        try:
+            name = operations.select(operation).name
+        except backends.BackendUnavailable:
+            continue
+        os.environ[f"ICON_BACKEND_{operation.upper()}"] = name
+        pinned[operation] = name
+    return pinned
+
+
+def run_cases(cases, repeat=DEFAULT_REPEAT):
+    """``{case name: result}`` for every case, printing progress"""
+    pinned = pin_backends()
+    print(f"🔧 Backends: {', '.join(f'{op}={name}' for op, name in pinned.items()) or 'none'}")
+    results = {}
+    for case in cases:
+        print(f"⏱️  {case.name}: {case.description}")
+        results[case.name] = run_case(case, repeat)
+    return results
+
+
+def save_results(path, results):
+    """Write results with the machine fingerprint they were measured on"""
+    from icon_pipeline import operations
+
+    data = {"version": RESULTS_VERSION, "fingerprint": operations.fingerprint(), "cases": results}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def load_results(path):
+    """Results JSON written by save_results"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark results version {data.get('version')}")
+    return data
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Regression messages for cases slower than ``baseline`` by ``threshold``
+
+    ``baseline`` is the ``cases`` mapping of load_results. Cases missing
+    from either side, skipped or failed are not compared.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or "seconds" not in base or "seconds" not in result:
+            continue
+        limit = base["seconds"] * (1 + threshold)
+        if result["seconds"] > limit:
+            regressions.append(f"{name}: {result['seconds'] * 1000:.1f} ms vs baseline "
+                               f"{base['seconds'] * 1000:.1f} ms "
+                               f"(+{(result['seconds'] / base['seconds'] - 1) * 100:.0f}%, "
+                               f"limit +{threshold * 100:.0f}%)")
+    return regressions
+
+
+def _format(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def print_report(results, baseline=None):
+    """Table of results, with the change against ``baseline`` when given"""
+    print(f"\n{'case':<12} {'time ms':>9} {'icons':>6} {'icons/s':>9} {'MP/s':>8} {'RSS MB':>8} {'vs base':>8}")
+    for name, result in results.items():
+        if "seconds" not in result:
+            status = "skipped: " + result["skipped"] if "skipped" in result else "error"
+            print(f"{name:<12} {status}")
+            if "error" in result:
+                print(result["error"].rstrip())
+            continue
+        change = "-"
+        base = (baseline or {}).get(name)
+        if base and base.get("seconds"):
+            change = f"{(result['seconds'] / base['seconds'] - 1) * 100:+.0f}%"
+        print(f"{name:<12} {result['seconds'] * 1000:>9.1f} {result['icons']:>6} "
+              f"{_format(result['icons_per_s'], '9.1f')} {_format(result['megapixels_per_s'], '8.2f')} "
+              f"{_format(result['peak_rss_mb'], '8.1f')} {change:>8}")
@@ -0,0 +1,126 @@
+"""
+Content-addressed incremental build cache for generated icons.
+
+Every output is keyed by a hash of everything that determines its pixels:
+the source file bytes, target size, padding, background color, resampling
+filter and encoder options. The manifest remembers the key each output was
+last built from, so unchanged outputs are skipped on the next run.
+"""
+
+import hashlib
+import json
+import os
+
+from icon_pipeline.parallel import run_tasks
+
+DEFAULT_MANIFEST = ".icon_build_cache.json"
+
+# Bump when the rendering code changes in a way that alters output pixels
+CACHE_VERSION = 1
+
+
+class BuildCache:
+    """On-disk manifest mapping output paths to the key they were built from"""
+
+    def __init__(self, manifest_path=DEFAULT_MANIFEST, force=False):
+        self.manifest_path = manifest_path
+        self.force = force
+        self._digests = {}
+        self.entries = {}
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def source_digest(self, path):
+        """SHA-256 of a source file, computed once per run"""
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(memo_key)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    h.update(block)
+            digest = h.hexdigest()
+            self._digests[memo_key] = digest
+        return digest
+
+    def key(self, **params):
+        """Cache key for one output from its render parameters"""
+        payload = json.dumps(params, sort_keys=True, default=list)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def is_fresh(self, output_path, key):
+        """True when ``output_path`` exists and was built from ``key``"""
+        if self.force:
+            return False
+        entry = self.entries.get(output_path)
+        if not entry or entry.get('key') != key:
+            return False
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return False
+        return stat.st_size == entry.get('bytes') and stat.st_mtime_ns == entry.get('mtime_ns')
+
+    def record(self, output_path, key):
+        """Remember that ``output_path`` is now up to date with ``key``"""
+        stat = os.stat(output_path)
+        self.entries[output_path] = {
+            'key': key,
+            'bytes': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+
+    def save(self):
+        """Write the manifest atomically"""
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'entries': self.entries}, f,
+                      indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def _paths(output):
+    return (output,) if isinstance(output, str) else tuple(output)
+
+
+def run_cached(func, plan, cache, jobs=None):
+    """Run only the stale entries of ``plan`` and record the ones that succeed
+
+    ``plan`` is a list of ``(outputs, key, task_args)`` where ``outputs`` is
+    one output path or a sequence of paths produced by the same task. An
+    entry is stale when any of its outputs is. Returns ``(built, skipped,
+    failed)`` counted in output files.
+    """
+    stale = [entry for entry in plan
+             if not all(cache.is_fresh(path, entry[1]) for path in _paths(entry[0]))]
+    skipped = sum(len(_paths(entry[0])) for entry in plan) - sum(len(_paths(entry[0])) for entry in stale)
+    if skipped:
+        print(f"⏭️  Up to date: {skipped} icons")
+
+    results = run_tasks(func, [task for _, _, task in stale], jobs=jobs)
+
+    built = failed = 0
+    for (outputs, key, _), ok in zip(stale, results):
+        paths = _paths(outputs)
+        if ok and all(os.path.exists(path) for path in paths):
+            for path in paths:
+                cache.record(path, key)
+            built += len(paths)
+        else:
+            failed += len(paths)
+    cache.save()
+    return built, skipped, failed
+
+
+def add_force_argument(parser):
+    """Register the shared ``--force`` option on an argparse parser"""
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every icon, ignoring the build cache')
+    return parser
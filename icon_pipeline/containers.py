@@ -0,0 +1,91 @@
+"""
+ICO and ICNS containers assembled from per-size renders.
+
+Each entry is taken from an in-memory render of exactly its size, so a
+container holds the same pixels as the matching PNG targets instead of
+one large PNG reopened from disk and downscaled again by Pillow. ICO
+entries of ``ICO_PNG_MIN_SIZE`` and up are stored PNG-compressed, smaller
+ones as 32-bit DIBs for older Windows shells; ICNS entries are all PNG.
+"""
+
+import struct
+
+from icon_pipeline.writer import default_writer, write_bytes
+
+ICO_SIZES = (16, 32, 48, 64, 128, 256)
+ICO_PNG_MIN_SIZE = 256
+
+# ICNS PNG entry types by pixel size; 32, 64, 256 and 512 are stored a
+# second time as the Retina (@2x) entry of half their size
+ICNS_TYPES = {
+    16: (b'icp4',),
+    32: (b'icp5', b'ic11'),
+    64: (b'icp6', b'ic12'),
+    128: (b'ic07',),
+    256: (b'ic08', b'ic13'),
+    512: (b'ic09', b'ic14'),
+    1024: (b'ic10',),
+}
+ICNS_SIZES = tuple(ICNS_TYPES)
+
+
+def _dib(img):
+    """32-bit BGRA DIB entry: BITMAPINFOHEADER, bottom-up pixels, AND mask"""
+    width, height = img.size
+    header = struct.pack('<IiiHHIIiiII', 40, width, height * 2, 1, 32, 0,
+                         width * height * 4, 0, 0, 0, 0)
+    pixels = img.convert('RGBA').tobytes('raw', 'BGRA', 0, -1)
+    # Alpha carries transparency; the 1-bit mask rows (padded to 32 bits) stay clear
+    mask = bytes(((width + 31) // 32) * 4 * height)
+    return header + pixels + mask
+
+
+def ico_bytes(images, png_options=None):
+    """ICO file from ``{size: RGBA image}``"""
+    png_options = png_options or {}
+    sizes = sorted(images)
+    entries = []
+    for size in sizes:
+        img = images[size]
+        if size >= ICO_PNG_MIN_SIZE:
+            entries.append(default_writer().encoded(img, **png_options))
+        else:
+            entries.append(_dib(img))
+
+    directory = struct.pack('<HHH', 0, 1, len(sizes))
+    offset = 6 + 16 * len(sizes)
+    for size, data in zip(sizes, entries):
+        # A width/height byte of 0 means 256
+        dimension = size if size < 256 else 0
+        directory += struct.pack('<BBBBHHII', dimension, dimension, 0, 0, 1, 32, len(data), offset)
+        offset += len(data)
+    return directory + b''.join(entries)
+
+
+def icns_bytes(images, png_options=None):
+    """ICNS file from ``{size: RGBA image}``; sizes must be ICNS_SIZES"""
+    png_options = png_options or {}
+    body = b''
+    for size in sorted(images):
+        if size not in ICNS_TYPES:
+            raise ValueError(f"No ICNS entry type for {size}x{size}")
+        data = default_writer().encoded(images[size], **png_options)
+        for icon_type in ICNS_TYPES[size]:
+            body += icon_type + struct.pack('>I', 8 + len(data)) + data
+    return b'icns' + struct.pack('>I', 8 + len(body)) + body
+
+
+def container_bytes(container_format, images, png_options=None):
+    """Encode ``images`` as an "ico" or "icns" container"""
+    if container_format == "ico":
+        return ico_bytes(images, png_options)
+    if container_format == "icns":
+        return icns_bytes(images, png_options)
+    raise ValueError(f"Unknown icon container format: {container_format}")
+
+
+def write_container(path, container_format, images, png_options=None):
+    """Atomically write a container; returns its size in bytes"""
+    data = container_bytes(container_format, images, png_options)
+    write_bytes(path, data)
+    return len(data)
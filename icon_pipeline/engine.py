@@ -0,0 +1,226 @@
+"""
+Single render engine for manifest-driven icon generation.
+
+A render is identified by (source, size, treatment). The engine renders
+every unique combination once and writes the result to all output paths
+that share it. ICO/ICNS containers are assembled from the same renders.
+"""
+
+import os
+from functools import lru_cache
+
+from icon_pipeline import manifest, operations, platform_metadata, profiling, sources, svg_render, trace
+from icon_pipeline.build_cache import run_cached
+from icon_pipeline.containers import write_container
+from icon_pipeline.png_encoder import pillow_save_options
+from icon_pipeline.writer import save_png
+
+
+def fit_logo(img, size, padding=0.0, background=None):
+    """Scale ``img`` to fit a ``size`` x ``size`` square, centered
+
+    ``padding`` is the fraction of ``size`` left empty on each side and
+    ``background`` an RGBA color (transparent when None).
+    """
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+
+    max_size = size - int(size * padding) * 2
+    img_ratio = img.width / img.height
+    if img_ratio > 1.0:
+        new_width = max_size
+        new_height = int(max_size / img_ratio)
+    else:
+        new_height = max_size
+        new_width = int(max_size * img_ratio)
+
+    resized_img = operations.resize(img, (new_width, new_height))
+    return _center_on_canvas(resized_img, size, background)
+
+
+def _center_on_canvas(img, size, background):
+    from PIL import Image
+
+    if background is None and img.size == (size, size):
+        return img
+    with trace.stage("composite"):
+        new_img = Image.new('RGBA', (size, size), background or (0, 0, 0, 0))
+        x = (size - img.width) // 2
+        y = (size - img.height) // 2
+        new_img.paste(img, (x, y), img)
+    return new_img
+
+
+# Renders kept per process, so containers reuse the bitmaps of PNG targets
+RENDER_CACHE_SIZE = 64
+
+
+def is_exact(source_name, size):
+    """Whether this render rasterizes a vector source directly (manifest exact_sizes)"""
+    return (size in manifest.exact_sizes()
+            and manifest.source_path(source_name).lower().endswith('.svg'))
+
+
+def render(source_name, size, treatment_name, exact=False):
+    """Render one unique bitmap as an RGBA image; callers must not modify it"""
+    path = manifest.source_path(source_name)
+    stat = os.stat(path)
+    exact = exact or is_exact(source_name, size)
+    return _render(path, stat.st_mtime_ns, stat.st_size, size, treatment_name, exact)
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render(path, mtime_ns, file_size, size, treatment_name, exact):
+    params = manifest.treatment(treatment_name)
+
+    if path.lower().endswith('.svg'):
+        inner = size - int(size * params["padding"]) * 2
+        img = svg_render.get_svg_renderer(path).render(inner, exact=exact)
+        return _center_on_canvas(img, size, params["background"])
+
+    return fit_logo(sources.load_rgba(path), size, params["padding"], params["background"])
+
+
+def clear():
+    """Drop cached renders, SVG masters and decoded sources"""
+    _render.cache_clear()
+    svg_render.clear()
+    sources.clear()
+
+
+def render_group(source_name, size, treatment_name, paths, profile=None, optimize=None):
+    """Render once and write the bitmap to every path in ``paths``
+
+    The PNG is encoded for the first path only; the others are linked or
+    copied from it by the shared writer. When tracing, the render is
+    charged to the first path.
+    """
+    with profiling.target(size):
+        return _render_group(source_name, size, treatment_name, paths, profile, optimize)
+
+
+def _render_group(source_name, size, treatment_name, paths, profile=None, optimize=None):
+    img = None
+    ok = True
+    for path in paths:
+        with trace.output(path):
+            if img is None:
+                try:
+                    img = render(source_name, size, treatment_name)
+                except Exception as e:
+                    for failed_path in paths:
+                        print(f"❌ Failed: {failed_path} - {e}")
+                    return False
+            try:
+                method = save_png(img, path, optimizer=optimize, **pillow_save_options(profile))
+                note = f" [{method}]" if method != "encode" else ""
+                print(f"✅ Created: {path} ({size}x{size}){note}")
+            except Exception as e:
+                print(f"❌ Failed: {path} - {e}")
+                ok = False
+    return ok
+
+
+def render_container(container_format, source_name, treatment_name, sizes, path, profile=None):
+    """Assemble an ICO/ICNS file from one render per size"""
+    with trace.output(path):
+        try:
+            images = {size: render(source_name, size, treatment_name) for size in sizes}
+            write_container(path, container_format, images, pillow_save_options(profile))
+        except Exception as e:
+            print(f"❌ Failed: {path} - {e}")
+            return False
+    print(f"✅ Created: {path} ({container_format.upper()}: {', '.join(map(str, sizes))})")
+    return True
+
+
+def _run_step(step, *args):
+    """Worker entry point for one build plan entry"""
+    return step(*args)
+
+
+def _backend_methods(source_name):
+    """Selected operation backends that affect the bytes of a render"""
+    operations_used = ["resize", "encode"]
+    if manifest.source_path(source_name).lower().endswith('.svg'):
+        operations_used.insert(0, "rasterize")
+    return {operation: operations.method(operation) for operation in operations_used}
+
+
+def render_key(cache, key, profile=None, optimize=None):
+    """Build-cache key for a RenderKey"""
+    return cache.key(
+        source=cache.source_digest(manifest.source_path(key.source)),
+        size=key.size,
+        treatment=manifest.treatment(key.treatment),
+        exact=is_exact(key.source, key.size),
+        backends=_backend_methods(key.source),
+        encoder=pillow_save_options(profile),
+        optimize=optimize,
+    )
+
+
+def container_key(cache, container, profile=None):
+    """Build-cache key for a manifest Container"""
+    return cache.key(
+        source=cache.source_digest(manifest.source_path(container.source)),
+        format=container.format,
+        sizes=container.sizes,
+        treatment=manifest.treatment(container.treatment),
+        exact=[size for size in container.sizes if is_exact(container.source, size)],
+        backends=_backend_methods(container.source),
+        encoder=pillow_save_options(profile),
+    )
+
+
+def plan(target_list, cache, profile=None, optimize=None, containers=()):
+    """Build plan for run_cached: one entry per unique render, then containers
+
+    Each entry is ``(outputs, cache key, task)``; nothing is rendered.
+    """
+    groups = manifest.group_renders(target_list)
+    entries = [(tuple(paths), render_key(cache, key, profile, optimize),
+                (render_group, key.source, key.size, key.treatment, tuple(paths), profile, optimize))
+               for key, paths in groups.items()]
+    entries += [(container.path, container_key(cache, container, profile),
+                 (render_container, container.format, container.source, container.treatment,
+                  container.sizes, container.path, profile))
+                for container in containers]
+    return entries
+
+
+def build(target_list, cache, jobs=None, profile=None, optimize=None, containers=(), metadata=()):
+    """Render all stale targets and containers, one render per unique bitmap
+
+    ``metadata`` entries (see platform_metadata) are written afterwards,
+    each only when every bitmap it references is up to date; the files
+    of the others count as failed. Returns ``(built, skipped, failed)``
+    counted in output files.
+    """
+    entries = plan(target_list, cache, profile, optimize, containers)
+    print(f"🧩 {len(target_list)} targets -> {len(entries) - len(containers)} unique renders")
+    built, skipped, failed = run_cached(_run_step, entries, cache, jobs=jobs)
+
+    keys = {path: key for outputs, key, _ in entries
+            for path in ((outputs,) if isinstance(outputs, str) else outputs)}
+    ready = []
+    for entry in metadata:
+        missing = [path for path in platform_metadata.bitmaps(entry)
+                   if not _is_built(cache, path, keys.get(path))]
+        if missing:
+            names = list(platform_metadata.files(entry))
+            print(f"❌ Not updated: {', '.join(names)} - {len(missing)} referenced icons "
+                  f"failed, e.g. {missing[0]}")
+            failed += len(names)
+        else:
+            ready.append(entry)
+    for path in platform_metadata.write(ready):
+        print(f"📝 Updated: {path}")
+    return built, skipped, failed
+
+
+def _is_built(cache, path, key):
+    """Whether ``path`` exists and, when planned, was last built from ``key``"""
+    if not os.path.exists(path):
+        return False
+    return key is None or cache.entries.get(path, {}).get('key') == key
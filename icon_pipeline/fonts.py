@@ -0,0 +1,209 @@
+"""
+Font resolution shared by every text-drawing script.
+
+Font directories are scanned once per process and indexed by family and
+style, read straight from each file's ``name`` table. Loaded fonts are
+memoized by (path, size), so repeated renders neither retry failing
+lookups nor re-parse font files. When no configured family is installed
+the scalable font bundled with Pillow is used instead of the bitmap
+default, so text keeps its requested size on bare CI images.
+"""
+
+import os
+import struct
+from collections import namedtuple
+from functools import lru_cache
+
+from PIL import ImageFont
+
+REPO_FONT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "assets", "fonts")
+
+SYSTEM_FONT_DIRS = (
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"),
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/Library/Fonts"),
+    "/Library/Fonts",
+    "/System/Library/Fonts",
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+)
+
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+DEFAULT_FAMILY = "Arial"
+
+# Metric-compatible substitutes tried after the requested family
+FAMILY_FALLBACKS = {
+    "arial": ("Liberation Sans", "Arimo", "Helvetica", "DejaVu Sans"),
+}
+
+# Loaded FreeTypeFont objects kept per process
+FONT_CACHE_SIZE = 64
+
+# Names foundries use for the upright, normal-weight face
+REGULAR_STYLES = ("regular", "book", "normal", "roman", "")
+
+FontFile = namedtuple("FontFile", "path family style")
+
+
+def style_key(style):
+    """Lowercase index key of a style name; "Book", "Roman" etc. become regular"""
+    style = " ".join(style.lower().replace("oblique", "italic").split())
+    return "regular" if style in REGULAR_STYLES else style
+
+
+def _is_plain(style):
+    return "bold" not in style and "italic" not in style
+
+
+def font_dirs():
+    """Directories to scan: ``ICON_FONT_DIRS``, the repo's fonts, system fonts"""
+    extra = os.environ.get("ICON_FONT_DIRS", "")
+    dirs = [d for d in extra.split(os.pathsep) if d]
+    return tuple(dirs) + (REPO_FONT_DIR,) + SYSTEM_FONT_DIRS
+
+
+def _name_records(f, offset):
+    """(family, style) from the ``name`` table of the face at ``offset``"""
+    f.seek(offset + 4)
+    num_tables, = struct.unpack(">H", f.read(2))
+    f.seek(offset + 12)
+    directory = f.read(16 * num_tables)
+    for i in range(num_tables):
+        tag, _, table_offset, table_length = struct.unpack_from(">4sIII", directory, 16 * i)
+        if tag == b"name":
+            break
+    else:
+        return None
+
+    f.seek(table_offset)
+    table = f.read(table_length)
+    _, count, strings = struct.unpack_from(">HHH", table)
+    names = {}
+    for i in range(count):
+        platform, encoding, language, name_id, length, start = struct.unpack_from(
+            ">HHHHHH", table, 6 + 12 * i)
+        if name_id not in (1, 2):
+            continue
+        raw = table[strings + start:strings + start + length]
+        # Prefer Windows US English, then any Unicode record, then Mac Roman
+        if platform == 3 and language == 0x409:
+            priority, text = 3, raw.decode("utf-16-be", "replace")
+        elif platform in (0, 3):
+            priority, text = 2, raw.decode("utf-16-be", "replace")
+        elif platform == 1 and encoding == 0:
+            priority, text = 1, raw.decode("mac_roman", "replace")
+        else:
+            continue
+        if priority > names.get(name_id, (0, None))[0]:
+            names[name_id] = (priority, text)
+    if 1 not in names:
+        return None
+    return names[1][1], names.get(2, (0, "Regular"))[1]
+
+
+def read_font_names(path):
+    """(family, style) of a font file, or None if it cannot be parsed"""
+    try:
+        with open(path, "rb") as f:
+            offset = 0
+            if f.read(4) == b"ttcf":
+                # Collections are indexed by their first face
+                f.seek(12)
+                offset, = struct.unpack(">I", f.read(4))
+            return _name_records(f, offset)
+    except (OSError, struct.error):
+        return None
+
+
+class FontIndex:
+    """Fonts found in a set of directories, keyed by family and style"""
+
+    def __init__(self, dirs=None):
+        self.dirs = font_dirs() if dirs is None else tuple(dirs)
+        self._families = None
+        self._files = None
+
+    def _scan(self):
+        families = {}
+        files = {}
+        for directory in self.dirs:
+            for root, _, names in os.walk(directory):
+                for name in sorted(names):
+                    if not name.lower().endswith(FONT_EXTENSIONS):
+                        continue
+                    path = os.path.join(root, name)
+                    files.setdefault(name.lower(), path)
+                    names_found = read_font_names(path)
+                    if names_found is None:
+                        continue
+                    family, style = names_found
+                    styles = families.setdefault(family.lower(), {})
+                    styles.setdefault(style_key(style), FontFile(path, family, style))
+        self._families = families
+        self._files = files
+
+    @property
+    def families(self):
+        if self._families is None:
+            self._scan()
+        return self._families
+
+    def find(self, family, style="Regular"):
+        """Path of ``family``/``style`` (or a file name like "arial.ttf"), or None"""
+        if self._files is None:
+            self._scan()
+        if family.lower() in self._files:
+            return self._files[family.lower()]
+        styles = self.families.get(family.lower())
+        if not styles:
+            return None
+        match = styles.get(style_key(style)) or styles.get("regular")
+        if match is None:
+            # Neither bold nor italic beats the alphabetically first face
+            plain = [styles[key] for key in styles if _is_plain(key)]
+            match = plain[0] if plain else next(iter(styles.values()))
+        return match.path
+
+    def resolve(self, family=DEFAULT_FAMILY, style="Regular"):
+        """Path of ``family`` or its first installed fallback, or None"""
+        for candidate in (family,) + FAMILY_FALLBACKS.get(family.lower(), ()):
+            path = self.find(candidate, style)
+            if path:
+                return path
+        return None
+
+
+@lru_cache(maxsize=1)
+def default_index():
+    """Process-wide index of the default font directories"""
+    return FontIndex()
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path, size):
+    """FreeTypeFont for ``path`` at ``size`` pixels, memoized"""
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def bundled_font(size):
+    """Pillow's bundled scalable font, or the bitmap default on old Pillow"""
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def get_font(size, family=DEFAULT_FAMILY, style="Regular"):
+    """Font of ``family``/``style`` at ``size`` pixels, falling back to the bundled font"""
+    size = max(1, int(size))
+    path = default_index().resolve(family, style)
+    if path:
+        try:
+            return load_font(path, size)
+        except OSError:
+            pass
+    return bundled_font(size)
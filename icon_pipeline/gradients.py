@@ -0,0 +1,69 @@
+"""
+Gradient and radial-glow fills built from whole-image operations.
+
+Backgrounds are produced with ``Image.linear_gradient``/``radial_gradient``
+plus a lookup table instead of drawing one line or ellipse at a time, so
+the cost is a handful of C-level passes regardless of size.
+"""
+
+import math
+
+from PIL import Image, ImageChops
+
+# Image.radial_gradient reaches 255 in the corners, so the edge midpoints
+# (one radius from the center) read 255 / sqrt(2)
+RADIAL_SCALE = math.sqrt(2)
+
+
+def vertical_gradient(size, top, bottom):
+    """RGB image fading from ``top`` (first row) to ``bottom`` (last row)"""
+    width, height = size
+    ramp = Image.linear_gradient('L').resize((width, height), Image.Resampling.BILINEAR)
+    return Image.composite(Image.new('RGB', size, bottom), Image.new('RGB', size, top), ramp)
+
+
+def ring_alpha_table(radius, step=10, peak=20):
+    """Accumulated alpha of stacked rings as a 256-entry lookup table
+
+    Models ``radius / step`` concentric discs shrinking by ``step`` pixels,
+    each with alpha ``peak * (1 - r / radius)``, composited over each other.
+    Indexed by ``Image.radial_gradient`` values, where ``i`` is the
+    distance ``i * RADIAL_SCALE * radius / 255``.
+    """
+    rings = [(r, int(peak * (1 - r / radius))) for r in range(radius, 0, -step)]
+    table = []
+    for i in range(256):
+        distance = i * RADIAL_SCALE * radius / 255
+        transparency = 1.0
+        for r, alpha in rings:
+            if r >= distance and alpha > 0:
+                transparency *= 1 - alpha / 255
+        table.append(round(255 * (1 - transparency)))
+    return table
+
+
+def glow_mask(radius, step=10, peak=20):
+    """``L`` mask of one ring glow, ``2 * radius`` pixels square"""
+    diameter = 2 * radius
+    distance = Image.radial_gradient('L').resize((diameter, diameter), Image.Resampling.BILINEAR)
+    return distance.point(ring_alpha_table(radius, step, peak))
+
+
+def glow_layer(size, glows, step=10, peak=20):
+    """Combined ``L`` mask of several ``(x, y, radius)`` glows
+
+    Overlapping glows are combined with screen blending, which matches
+    compositing them one after another.
+    """
+    layer = Image.new('L', size, 0)
+    for x, y, radius in glows:
+        spot = Image.new('L', size, 0)
+        spot.paste(glow_mask(radius, step, peak), (round(x - radius), round(y - radius)))
+        layer = ImageChops.screen(layer, spot)
+    return layer
+
+
+def apply_glow(image, mask, color=(255, 255, 255)):
+    """Composite ``color`` over ``image`` through ``mask`` in place"""
+    image.paste(color, (0, 0, *image.size), mask)
+    return image
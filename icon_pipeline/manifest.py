@@ -0,0 +1,189 @@
+"""
+Declarative icon manifest shared by all generator scripts.
+
+icon_manifest.json lists every platform target (path, pixel size) once,
+together with the named sources and treatments a target can be rendered
+from. Generators resolve targets against it and group them by
+(source, size, treatment) so each unique bitmap is rendered only once.
+Containers (ICO/ICNS) list the sizes they bundle from the same renders,
+and metadata entries (Contents.json, web manifest, adaptive icons) declare
+the bitmaps they reference, which become targets too. ``exact_sizes``
+lists target sizes that vector sources rasterize directly instead of
+downscaling a master, for small icons where hinting matters.
+"""
+
+import json
+import os
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+
+from icon_pipeline import platform_metadata
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon_manifest.json")
+
+PLATFORMS = ("android", "ios", "macos", "web", "windows", "linux")
+
+PLATFORM_LABELS = {
+    "android": "Android",
+    "ios": "iOS",
+    "macos": "macOS",
+    "web": "Web",
+    "windows": "Windows",
+    "linux": "Linux",
+}
+
+CONTAINER_FORMATS = ("ico", "icns")
+
+Target = namedtuple("Target", "platform path size source treatment")
+
+# A multi-resolution file (ICO/ICNS) built from one render per size
+Container = namedtuple("Container", "platform path format sizes source treatment")
+
+# One unique bitmap: targets sharing a RenderKey get identical pixels
+RenderKey = namedtuple("RenderKey", "source size treatment")
+
+
+@lru_cache(maxsize=4)
+def load_manifest(manifest_path=DEFAULT_MANIFEST):
+    """Read and validate the manifest once; callers must not mutate it"""
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    sources = manifest.get("sources", {})
+    treatments = manifest.get("treatments", {})
+    defaults = manifest.get("defaults", {})
+    for name in (defaults.get("source"), defaults.get("treatment")):
+        if name is None:
+            raise ValueError(f"{manifest_path}: defaults need a source and a treatment")
+    for entry in manifest.get("targets", []) + manifest.get("containers", []):
+        if entry.get("source", defaults["source"]) not in sources:
+            raise ValueError(f"{manifest_path}: unknown source for {entry['path']}")
+        if entry.get("treatment", defaults["treatment"]) not in treatments:
+            raise ValueError(f"{manifest_path}: unknown treatment for {entry['path']}")
+    for entry in manifest.get("containers", []):
+        if entry.get("format") not in CONTAINER_FORMATS:
+            raise ValueError(f"{manifest_path}: unknown container format for {entry['path']}")
+    for entry in manifest.get("metadata", []):
+        if entry.get("format") not in platform_metadata.FORMATS:
+            raise ValueError(f"{manifest_path}: unknown metadata format for {entry['platform']}")
+    if not all(isinstance(size, int) and size > 0 for size in manifest.get("exact_sizes", [])):
+        raise ValueError(f"{manifest_path}: exact_sizes must be positive pixel sizes")
+    return manifest
+
+
+def source_path(name, manifest_path=DEFAULT_MANIFEST):
+    """File path of a named source"""
+    return load_manifest(manifest_path)["sources"][name]
+
+
+def treatment(name, manifest_path=DEFAULT_MANIFEST):
+    """Treatment parameters (padding fraction, background color)"""
+    params = load_manifest(manifest_path)["treatments"][name]
+    background = params.get("background")
+    return {
+        "padding": float(params.get("padding", 0)),
+        "background": tuple(background) if background is not None else None,
+    }
+
+
+def exact_sizes(manifest_path=DEFAULT_MANIFEST):
+    """Target sizes rendered straight from vector sources, without a master"""
+    return frozenset(load_manifest(manifest_path).get("exact_sizes", []))
+
+
+def _check_overrides(manifest, source, treatment):
+    if source is not None and source not in manifest["sources"]:
+        raise ValueError(f"Unknown icon source: {source}")
+    if treatment is not None and treatment not in manifest["treatments"]:
+        raise ValueError(f"Unknown icon treatment: {treatment}")
+
+
+def targets(platforms=None, source=None, treatment=None, manifest_path=DEFAULT_MANIFEST):
+    """Resolve manifest targets, optionally overriding source and treatment
+
+    ``platforms`` limits the result to the given platform names. Overrides
+    replace the manifest defaults and any per-target values, which is how a
+    generator script selects e.g. the logo source for every platform.
+    """
+    manifest = load_manifest(manifest_path)
+    defaults = manifest["defaults"]
+    _check_overrides(manifest, source, treatment)
+
+    resolved = []
+    for entry in _target_entries(manifest):
+        if platforms is not None and entry["platform"] not in platforms:
+            continue
+        resolved.append(Target(
+            platform=entry["platform"],
+            path=entry["path"],
+            size=int(entry["size"]),
+            source=source or entry.get("source", defaults["source"]),
+            treatment=treatment or entry.get("treatment", defaults["treatment"]),
+        ))
+    return resolved
+
+
+def _target_entries(manifest):
+    """Explicit targets plus the bitmaps metadata entries reference, by platform"""
+    entries = list(manifest["targets"])
+    for meta in manifest.get("metadata", []):
+        for path, size in platform_metadata.bitmaps(meta).items():
+            entry = {"platform": meta["platform"], "path": path, "size": size}
+            for field in ("source", "treatment"):
+                if field in meta:
+                    entry[field] = meta[field]
+            entries.append(entry)
+    order = {platform: i for i, platform in enumerate(PLATFORMS)}
+    return sorted(entries, key=lambda entry: order.get(entry["platform"], len(order)))
+
+
+def metadata(platforms=None, manifest_path=DEFAULT_MANIFEST):
+    """Metadata entries (see platform_metadata) for the given platforms"""
+    return [entry for entry in load_manifest(manifest_path).get("metadata", [])
+            if platforms is None or entry["platform"] in platforms]
+
+
+def containers(platforms=None, source=None, treatment=None, manifest_path=DEFAULT_MANIFEST):
+    """Resolve manifest containers, with the same overrides as ``targets``"""
+    manifest = load_manifest(manifest_path)
+    defaults = manifest["defaults"]
+    _check_overrides(manifest, source, treatment)
+
+    resolved = []
+    for entry in manifest.get("containers", []):
+        if platforms is not None and entry["platform"] not in platforms:
+            continue
+        resolved.append(Container(
+            platform=entry["platform"],
+            path=entry["path"],
+            format=entry["format"],
+            sizes=tuple(int(size) for size in entry["sizes"]),
+            source=source or entry.get("source", defaults["source"]),
+            treatment=treatment or entry.get("treatment", defaults["treatment"]),
+        ))
+    return resolved
+
+
+def group_renders(target_list):
+    """Map each unique RenderKey to the output paths that share it, in plan order"""
+    groups = OrderedDict()
+    for target in target_list:
+        key = RenderKey(target.source, target.size, target.treatment)
+        groups.setdefault(key, []).append(target.path)
+    return groups
+
+
+def directories(target_list):
+    """Output directories needed by ``target_list``, in plan order"""
+    seen = OrderedDict()
+    for target in target_list:
+        seen.setdefault(os.path.dirname(target.path), None)
+    return [d for d in seen if d]
+
+
+def platform_counts(target_list):
+    """Number of targets per platform, in manifest platform order"""
+    counts = OrderedDict((platform, 0) for platform in PLATFORMS)
+    for target in target_list:
+        counts[target.platform] = counts.get(target.platform, 0) + 1
+    return OrderedDict((p, n) for p, n in counts.items() if n)
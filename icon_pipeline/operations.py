@@ -0,0 +1,369 @@
+"""
+Pluggable implementations of the pipeline's hot operations.
+
+Three operations dominate every build: rasterizing the SVG, resizing
+bitmaps, and encoding PNGs. Each has one or more interchangeable
+implementations built on cairosvg, Pillow, or the dependency-free
+png_encoder. The first time an operation is needed on a machine, every
+available implementation runs a short microbenchmark on a fixed
+synthetic input. The fastest one is chosen, and the decision is
+recorded in ``.icon_backends.json`` together with the machine and
+library versions it was measured on. Later runs read the recorded
+decision. The benchmark runs again only when that fingerprint changes,
+so dev laptops and minimal CI images each get their fastest path
+without anyone editing scripts.
+
+``ICON_BACKEND_<OPERATION>`` (e.g. ``ICON_BACKEND_ENCODE=python``) forces
+an implementation and skips the benchmark for that operation.
+
+Each process settles every operation at most once, including the
+outcome that no implementation works. Build cache keys name the
+implementation without benchmarking (see ``method``), so planning a
+fully cached build never runs a microbenchmark.
+"""
+
+import json
+import os
+import platform
+import time
+from collections import namedtuple
+
+from icon_pipeline import backends, trace
+
+DEFAULT_DECISIONS = ".icon_backends.json"
+
+# Bump when implementations or benchmark inputs change, so that earlier
+# decisions are measured again
+DECISIONS_VERSION = 1
+
+# Timed runs per implementation; the fastest run counts
+BENCHMARK_REPEAT = 3
+
+# ``func`` implements the operation; ``method`` identifies its output in
+# build cache keys, so switching to an implementation that changes the
+# pixels invalidates the affected icons
+Implementation = namedtuple('Implementation', 'name requires method func')
+
+# operation -> Implementation settled in this process, or the
+# BackendUnavailable to raise when no implementation works here
+_selected = {}
+# decisions file path -> decisions read from it by this process
+_recorded = {}
+
+
+def _rasterize_cairosvg(svg_data, size, url=None):
+    import io
+    from PIL import Image
+
+    cairosvg = backends.load("cairosvg")
+    png_data = cairosvg.svg2png(bytestring=svg_data, url=url,
+                                output_width=size, output_height=size)
+    img = Image.open(io.BytesIO(png_data))
+    img.load()
+    return img.convert('RGBA') if img.mode != 'RGBA' else img
+
+
+def _resize_pyramid(img, size):
+    from icon_pipeline import resample
+
+    return resample.resize(img, size)
+
+
+def _resize_pillow(img, size):
+    from PIL import Image
+
+    return img.resize(size, Image.Resampling.LANCZOS)
+
+
+def _encode_pillow(img, **options):
+    import io
+
+    buffer = io.BytesIO()
+    img.save(buffer, 'PNG', **options)
+    return buffer.getvalue()
+
+
+def _encode_python(img, **options):
+    # Only uses the image's own methods, so it needs no imaging library
+    from icon_pipeline import png_encoder
+
+    if img.mode not in png_encoder.COLOR_TYPES:
+        img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+    row_size = img.width * len(img.getbands())
+    data = img.tobytes()
+    rows = (data[offset:offset + row_size] for offset in range(0, len(data), row_size))
+    return png_encoder.encode_png(img.width, img.height, rows, img.mode,
+                                  png_encoder.options_from_pillow(options))
+
+
+def _resample_method():
+    from icon_pipeline import resample
+
+    return resample.METHOD
+
+
+OPERATIONS = {
+    "rasterize": (
+        Implementation("cairosvg", ("cairosvg", "pillow"), "cairosvg", _rasterize_cairosvg),
+    ),
+    "resize": (
+        Implementation("pyramid", ("pillow",), _resample_method, _resize_pyramid),
+        Implementation("pillow", ("pillow",), "lanczos", _resize_pillow),
+    ),
+    "encode": (
+        Implementation("pillow", ("pillow",), "pillow", _encode_pillow),
+        Implementation("python", (), "png_encoder", _encode_python),
+    ),
+}
+
+BENCHMARK_SVG = b"""<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
+<defs><linearGradient id="g" x1="0" y1="0" x2="1" y2="1">
+<stop offset="0" stop-color="#6366F1"/><stop offset="1" stop-color="#22D3EE"/>
+</linearGradient></defs>
+<rect x="6" y="6" width="88" height="88" rx="20" fill="url(#g)"/>
+<circle cx="50" cy="50" r="26" fill="none" stroke="#fff" stroke-width="6"/>
+<path d="M38 50 L48 60 L64 40" fill="none" stroke="#fff" stroke-width="6"/>
+</svg>"""
+
+
+def benchmark_image(size):
+    """Deterministic RGBA image with smooth and detailed regions"""
+    from PIL import Image, ImageDraw
+
+    img = Image.linear_gradient('L').resize((size, size))
+    img = Image.merge('RGBA', (img, img.rotate(90), img.rotate(180), Image.new('L', (size, size), 255)))
+    draw = ImageDraw.Draw(img)
+    for i in range(0, size, max(1, size // 16)):
+        draw.ellipse([i // 2, i // 3, size - i // 3, size - i // 2], outline=(255, i % 256, 0, 160))
+    return img
+
+
+def _benchmark_call(operation):
+    """Zero-argument callable that runs ``operation`` once on fixed input"""
+    if operation == "rasterize":
+        return lambda func: func(BENCHMARK_SVG, 256)
+    if operation == "resize":
+        img = benchmark_image(1024)
+        return lambda func: [func(img.copy(), (size, size)) for size in (192, 96, 48)]
+    if operation == "encode":
+        img = benchmark_image(256)
+        return lambda func: func(img, compress_level=6)
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+def _implementations(operation):
+    try:
+        return OPERATIONS[operation]
+    except KeyError:
+        raise ValueError(f"Unknown operation: {operation}") from None
+
+
+def available(operation):
+    """Implementations of ``operation`` whose backends are installed"""
+    return [impl for impl in _implementations(operation)
+            if not backends.missing(*impl.requires)]
+
+
+def benchmark(operation, repeat=BENCHMARK_REPEAT, errors=None):
+    """Best time in seconds per installed implementation
+
+    Implementations that fail (e.g. cairosvg without libcairo) are
+    reported as None; when ``errors`` is a dict, it receives their
+    exceptions by name.
+    """
+    run = _benchmark_call(operation)
+    timings = {}
+    for impl in available(operation):
+        try:
+            # The first call also pays for imports and lazy setup
+            run(impl.func)
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run(impl.func)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[impl.name] = best
+        except Exception as e:
+            timings[impl.name] = None
+            if errors is not None:
+                errors[impl.name] = e
+    return timings
+
+
+def fingerprint():
+    """Machine and library versions that a recorded decision is valid for"""
+    from importlib import metadata
+
+    versions = {}
+    for name, (_, package) in sorted(backends.BACKENDS.items()):
+        try:
+            versions[name] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return {
+        "version": DECISIONS_VERSION,
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "backends": versions,
+    }
+
+
+def _load_decisions(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("fingerprint") != fingerprint():
+        return {}
+    return data.get("decisions", {})
+
+
+def _decisions(path):
+    """Decisions recorded in ``path``, read once per process"""
+    if path not in _recorded:
+        _recorded[path] = _load_decisions(path)
+    return _recorded[path]
+
+
+def _save_decisions(path, decisions):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"fingerprint": fingerprint(), "decisions": decisions}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _by_name(operation, name):
+    for impl in _implementations(operation):
+        if impl.name == name:
+            return impl
+    choices = ", ".join(impl.name for impl in _implementations(operation))
+    raise ValueError(f"Unknown {operation} backend: {name} (choose from {choices})")
+
+
+def _unavailable(operation, errors, decisions_path=None):
+    """BackendUnavailable naming why each installed implementation failed
+
+    ``decisions_path`` is given when the failure was read from there.
+    """
+    if not errors:
+        needed = sorted({name for impl in _implementations(operation) for name in impl.requires})
+        return backends.BackendUnavailable(
+            f"No working {operation} backend; install one with: {backends.install_hint(needed)}")
+    causes = "; ".join(f"{name}: {error}" for name, error in sorted(errors.items()))
+    message = f"No working {operation} backend ({causes})"
+    if decisions_path:
+        message += f"; recorded in {decisions_path}, delete it to measure again"
+    return backends.BackendUnavailable(message)
+
+
+def _decided(operation, decisions_path):
+    """Forced or recorded Implementation for ``operation``, or None
+
+    A recorded failure is returned as the BackendUnavailable to raise.
+    """
+    forced = os.environ.get(f"ICON_BACKEND_{operation.upper()}")
+    if forced:
+        return _by_name(operation, forced)
+    recorded = _decisions(decisions_path).get(operation)
+    if recorded and recorded["backend"] is None:
+        return _unavailable(operation, recorded.get("errors"), decisions_path)
+    if recorded:
+        impl = _by_name(operation, recorded["backend"])
+        if impl in available(operation):
+            return impl
+    return None
+
+
+def select(operation, decisions_path=DEFAULT_DECISIONS):
+    """The Implementation used for ``operation`` in this process
+
+    Order of precedence: the ``ICON_BACKEND_<OPERATION>`` environment
+    variable, a decision recorded for this machine, a new benchmark run
+    (whose result is recorded). Raises BackendUnavailable when no
+    implementation works here. The outcome, failure included, is kept
+    for the rest of the process.
+    """
+    if operation not in _selected:
+        _selected[operation] = _decided(operation, decisions_path) or _measure(operation, decisions_path)
+    impl = _selected[operation]
+    if isinstance(impl, backends.BackendUnavailable):
+        raise impl
+    return impl
+
+
+def _measure(operation, decisions_path):
+    """Benchmark ``operation`` and record the outcome
+
+    Returns the fastest Implementation, or the BackendUnavailable to
+    raise when none works. Failures are recorded too, so that worker
+    processes do not each run the benchmark again.
+    """
+    installed = available(operation)
+    if len(installed) == 1 and not installed[0].requires:
+        return installed[0]  # nothing to compare, and it cannot fail to load
+    errors = {}
+    timings = benchmark(operation, errors=errors)
+    working = {name: seconds for name, seconds in timings.items() if seconds is not None}
+    name = min(working, key=working.get) if working else None
+    decisions = _decisions(decisions_path)
+    decisions[operation] = {"backend": name, "timings": timings}
+    if not working:
+        errors = {name: f"{type(error).__name__}: {error}" for name, error in errors.items()}
+        decisions[operation]["errors"] = errors
+    if installed:
+        try:
+            _save_decisions(decisions_path, decisions)
+        except OSError:
+            pass  # read-only checkout: the decision lasts for this process only
+    return _by_name(operation, name) if working else _unavailable(operation, errors)
+
+
+def reset():
+    """Forget the implementations settled and the decisions read in this process"""
+    _selected.clear()
+    _recorded.clear()
+
+
+def method(operation, decisions_path=DEFAULT_DECISIONS):
+    """Cache-key identifier of the implementation ``operation`` uses
+
+    Never benchmarks, so planning stays cheap: an operation that is not
+    forced, recorded or settled yet is keyed by its first installed
+    implementation. When a benchmark later settles on another one, the
+    key changes and the affected icons are rebuilt once. None when no
+    implementation is installed or none works.
+    """
+    impl = _selected.get(operation) or _decided(operation, decisions_path)
+    if isinstance(impl, backends.BackendUnavailable):
+        return None
+    if impl is None:
+        installed = available(operation)
+        if not installed:
+            return None
+        impl = installed[0]
+    return impl.method() if callable(impl.method) else impl.method
+
+
+def rasterize(svg_data, size, url=None):
+    """Render SVG bytes to a ``size`` x ``size`` RGBA image"""
+    func = select("rasterize").func
+    with trace.stage("rasterize"):
+        return func(svg_data, size, url=url)
+
+
+def resize(img, size):
+    """LANCZOS-quality resize of ``img`` to ``size`` (width, height)"""
+    func = select("resize").func
+    with trace.stage("resize"):
+        return func(img, size)
+
+
+def encode(img, **options):
+    """PNG bytes of ``img``; ``options`` are Pillow PNG save options"""
+    func = select("encode").func
+    with trace.stage("encode"):
+        return func(img, **options)
@@ -0,0 +1,133 @@
+"""
+Post-processing stage that shrinks icons and banners.
+
+Each image is re-encoded as an indexed-palette PNG when it has at most 256
+colors (verified to be lossless), or optionally quantized when the result
+stays above a PSNR threshold. Every candidate is tried with several zlib
+strategies, ancillary chunks are dropped, and the smallest encoding wins.
+"""
+
+import io
+import math
+import os
+import zlib
+from collections import namedtuple
+
+# mode: "lossless" (palette only when exact) or "quantize" (lossy allowed)
+OptimizeOptions = namedtuple('OptimizeOptions', 'mode min_psnr')
+
+OPTIMIZE_MODES = ("lossless", "quantize")
+
+DEFAULT_MIN_PSNR = 40.0
+
+STRATEGIES = (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED, zlib.Z_RLE, zlib.Z_HUFFMAN_ONLY)
+
+
+def _encode(img, **options):
+    buffer = io.BytesIO()
+    # icc_profile=None keeps Pillow from copying ancillary chunks from img.info
+    img.save(buffer, 'PNG', icc_profile=None, **options)
+    return buffer.getvalue()
+
+
+def psnr(original, candidate):
+    """Peak signal-to-noise ratio in dB between two images of the same mode"""
+    from PIL import ImageChops, ImageStat
+
+    diff = ImageChops.difference(original, candidate)
+    stat = ImageStat.Stat(diff)
+    count = stat.count[0] * len(stat.count)
+    mse = sum(stat.sum2) / count
+    if mse == 0:
+        return math.inf
+    return 10 * math.log10(255 ** 2 / mse)
+
+
+def _to_palette(img, colors):
+    from PIL import Image
+
+    method = Image.Quantize.FASTOCTREE if img.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+    return img.quantize(colors=colors, method=method, dither=Image.Dither.NONE)
+
+
+def palette_image(img):
+    """Exact indexed-palette copy of ``img``, or None if it has > 256 colors"""
+    if img.mode not in ('RGB', 'RGBA'):
+        return None
+    colors = img.getcolors(256)
+    if colors is None:
+        return None
+    candidate = _to_palette(img, len(colors))
+    if candidate.convert(img.mode).tobytes() != img.tobytes():
+        return None
+    return candidate
+
+
+def quantized_image(img, min_psnr=DEFAULT_MIN_PSNR, colors=256):
+    """Lossy 256-color copy of ``img`` if it keeps at least ``min_psnr`` dB"""
+    if img.mode not in ('RGB', 'RGBA'):
+        return None
+    candidate = _to_palette(img, colors)
+    if psnr(img, candidate.convert(img.mode)) < min_psnr:
+        return None
+    return candidate
+
+
+def optimize_image(img, options=None):
+    """Smallest PNG encoding of ``img`` across palette and zlib strategies"""
+    options = options or OptimizeOptions("lossless", DEFAULT_MIN_PSNR)
+    candidates = [img]
+    reduced = palette_image(img)
+    if reduced is None and options.mode == "quantize":
+        reduced = quantized_image(img, options.min_psnr)
+    if reduced is not None:
+        candidates.append(reduced)
+
+    best = None
+    for candidate in candidates:
+        encodings = [_encode(candidate, optimize=True)]
+        encodings += [_encode(candidate, compress_level=9, compress_type=strategy)
+                      for strategy in STRATEGIES]
+        for data in encodings:
+            if best is None or len(data) < len(best):
+                best = data
+    return best
+
+
+def optimize_file(path, options=None):
+    """Rewrite ``path`` in place if a smaller encoding exists
+
+    Returns ``(bytes_before, bytes_after)`` and prints the saving.
+    """
+    from PIL import Image
+
+    before = os.path.getsize(path)
+    with Image.open(path) as img:
+        img.load()
+        data = optimize_image(img, options)
+
+    after = before
+    if len(data) < before:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        after = len(data)
+    print(f"🗜️  {path}: {before} -> {after} bytes (saved {before - after})")
+    return before, after
+
+
+def add_optimize_arguments(parser):
+    """Register the shared ``--optimize`` and ``--min-psnr`` options"""
+    parser.add_argument('--optimize', choices=OPTIMIZE_MODES, default=None,
+                        help='shrink PNGs: lossless palette reduction, or quantize when quality allows')
+    parser.add_argument('--min-psnr', type=float, default=DEFAULT_MIN_PSNR,
+                        help=f'quality floor in dB for --optimize quantize (default {DEFAULT_MIN_PSNR})')
+    return parser
+
+
+def optimize_options(args):
+    """OptimizeOptions from parsed arguments, or None when disabled"""
+    if not args.optimize:
+        return None
+    return OptimizeOptions(args.optimize, args.min_psnr)
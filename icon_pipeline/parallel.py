@@ -0,0 +1,67 @@
+"""
+Process-pool execution of icon render plans.
+
+Rasterizing, resizing and PNG encoding are CPU-bound and hold the GIL, so
+targets are fanned out across processes. Each task's stdout is captured in
+the worker and replayed by the parent in plan order, keeping logs
+deterministic regardless of completion order.
+"""
+
+import contextlib
+import io
+import os
+
+from icon_pipeline import profiling, trace
+
+
+def default_jobs():
+    """Number of worker processes to use when none is requested"""
+    return os.cpu_count() or 1
+
+
+def _call_captured(payload):
+    """Run one task in a worker, returning (result, captured stdout, trace records)"""
+    func, args = payload
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        try:
+            result = func(*args)
+        except Exception as e:
+            print(f"❌ Failed: {args} - {e}")
+            result = False
+    return result, buffer.getvalue(), trace.drain()
+
+
+def run_tasks(func, tasks, jobs=None):
+    """Call ``func(*task)`` for every task, in parallel when jobs > 1
+
+    ``func`` must be a module-level function so it can be pickled. Returns
+    the list of results in the same order as ``tasks``.
+    """
+    tasks = [tuple(task) for task in tasks]
+    jobs = default_jobs() if jobs is None else max(1, jobs)
+    # Profilers only see this process, so profiled runs stay serial
+    if profiling.active():
+        jobs = 1
+    jobs = min(jobs, len(tasks)) if tasks else 1
+
+    if jobs == 1:
+        return [func(*task) for task in tasks]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        payloads = [(func, task) for task in tasks]
+        for result, output, records in executor.map(_call_captured, payloads):
+            print(output, end='')
+            trace.extend(records)
+            results.append(result)
+    return results
+
+
+def add_jobs_argument(parser):
+    """Register the shared ``-j/--jobs`` option on an argparse parser"""
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='worker processes (default: all cores, 1 = serial)')
+    return parser
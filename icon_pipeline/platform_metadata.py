@@ -0,0 +1,140 @@
+"""
+Platform icon metadata generated from the same plan as the bitmaps.
+
+Each ``metadata`` entry of icon_manifest.json both declares the bitmaps a
+platform needs and produces the file that references them: an Xcode
+``Contents.json``, the ``icons`` of a web app manifest, or Android
+adaptive-icon XML. Slots that need the same pixel size share one file,
+so every size is rendered once.
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+FORMATS = ("xcassets", "web_manifest", "adaptive_icon")
+
+ADAPTIVE_ICON_XML = """<?xml version="1.0" encoding="utf-8"?>
+<adaptive-icon xmlns:android="http://schemas.android.com/apk/res/android">
+    <background android:drawable="@color/{name}_background"/>
+    <foreground>
+        <inset
+            android:drawable="@mipmap/{name}_foreground"
+            android:inset="{inset}"/>
+    </foreground>
+</adaptive-icon>
+"""
+
+BACKGROUND_COLOR_XML = """<?xml version="1.0" encoding="utf-8"?>
+<resources>
+    <color name="{name}_background">{color}</color>
+</resources>
+"""
+
+
+def slot_pixels(image):
+    """Pixel size of an asset catalog slot, e.g. 83.5x83.5 @2x -> 167"""
+    points = float(image["size"].split("x")[0])
+    return round(points * int(image["scale"].rstrip("x")))
+
+
+def _xcassets_files(entry):
+    return OrderedDict(
+        (os.path.join(entry["directory"], entry["filename"].format(pixels=pixels)), pixels)
+        for pixels in sorted({slot_pixels(image) for image in entry["images"]}))
+
+
+def _web_files(entry):
+    root = os.path.dirname(entry["path"])
+    return OrderedDict((os.path.join(root, icon["src"]), int(icon["size"])) for icon in entry["icons"])
+
+
+def _foreground_path(entry, density):
+    return os.path.join(entry["res"], f"mipmap-{density}", f"{entry['name']}_foreground.png")
+
+
+def _adaptive_files(entry):
+    return OrderedDict((_foreground_path(entry, density), int(pixels))
+                       for density, pixels in entry["densities"].items())
+
+
+def bitmaps(entry):
+    """Ordered ``{path: pixel size}`` of the bitmaps an entry references"""
+    if entry["format"] == "xcassets":
+        return _xcassets_files(entry)
+    if entry["format"] == "web_manifest":
+        return _web_files(entry)
+    if entry["format"] == "adaptive_icon":
+        return _adaptive_files(entry)
+    raise ValueError(f"Unknown metadata format: {entry['format']}")
+
+
+def _contents_json(entry):
+    images = []
+    for image in entry["images"]:
+        pixels = slot_pixels(image)
+        slot = dict(image)
+        slot["filename"] = entry["filename"].format(pixels=pixels)
+        images.append(slot)
+    contents = {"images": images, "info": {"author": "xcode", "version": 1}}
+    return {os.path.join(entry["directory"], "Contents.json"): json.dumps(contents, indent=2) + "\n"}
+
+
+def _web_manifest(entry):
+    path = entry["path"]
+    web_manifest = OrderedDict()
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            web_manifest = json.load(f, object_pairs_hook=OrderedDict)
+    icons = []
+    for icon in entry["icons"]:
+        item = OrderedDict(src=icon["src"], sizes=f"{icon['size']}x{icon['size']}", type="image/png")
+        if icon.get("purpose"):
+            item["purpose"] = icon["purpose"]
+        icons.append(item)
+    web_manifest["icons"] = icons
+    return {path: json.dumps(web_manifest, indent=4, ensure_ascii=False)}
+
+
+def _adaptive_icon(entry):
+    name = entry["name"]
+    return {
+        os.path.join(entry["res"], "mipmap-anydpi-v26", f"{name}.xml"):
+            ADAPTIVE_ICON_XML.format(name=name, inset=entry["inset"]),
+        os.path.join(entry["res"], "values", f"{name}_background.xml"):
+            BACKGROUND_COLOR_XML.format(name=name, color=entry["background"]),
+    }
+
+
+def files(entry):
+    """``{path: text}`` of the metadata files an entry produces"""
+    if entry["format"] == "xcassets":
+        return _contents_json(entry)
+    if entry["format"] == "web_manifest":
+        return _web_manifest(entry)
+    if entry["format"] == "adaptive_icon":
+        return _adaptive_icon(entry)
+    raise ValueError(f"Unknown metadata format: {entry['format']}")
+
+
+def write(entries):
+    """Write the metadata files of ``entries``, leaving unchanged files untouched
+
+    Returns the list of paths that were written.
+    """
+    written = []
+    for entry in entries:
+        for path, text in files(entry).items():
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    if f.read() == text:
+                        continue
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+            written.append(path)
+    return written
@@ -0,0 +1,261 @@
+"""
+Dependency-free streaming PNG encoder.
+
+Scanlines are fed one at a time into a ``zlib.compressobj`` and the
+compressed stream is emitted as fixed-size IDAT chunks, so the raw image
+is never held in memory. Solid fills reuse one compressed block pattern
+instead of compressing every row. Used by the scripts that must work
+without PIL.
+"""
+
+import itertools
+import os
+import struct
+import zlib
+from collections import namedtuple
+
+from icon_pipeline.png_filters import (
+    FILTER_TYPES, NONE, SUB, UP, adaptive_filter_row, filter_row,
+)
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# mode -> (PNG color type, bytes per pixel)
+COLOR_TYPES = {
+    'RGB': (2, 3),
+    'RGBA': (6, 4),
+}
+
+# IDAT payloads are split into chunks of exactly this size (the last may
+# be shorter), bounding the memory held for compressed data
+IDAT_CHUNK_SIZE = 32 * 1024
+
+# Raw bytes per repeated block when encoding solid fills
+SOLID_BLOCK_SIZE = 256 * 1024
+
+# zlib stream header: deflate, 32K window, default-compression flags
+ZLIB_HEADER = b'\x78\x9c'
+
+# filter: a FILTER_TYPES name or "adaptive"; level/strategy go to zlib
+EncoderOptions = namedtuple('EncoderOptions', 'filter level strategy')
+
+PROFILES = {
+    'fast': EncoderOptions('none', 1, zlib.Z_DEFAULT_STRATEGY),
+    'default': EncoderOptions('none', 6, zlib.Z_DEFAULT_STRATEGY),
+    'smallest': EncoderOptions('adaptive', 9, zlib.Z_FILTERED),
+}
+
+DEFAULT_PROFILE = 'default'
+
+
+def chunk(tag, data=b''):
+    """Build one PNG chunk with its length and CRC"""
+    crc = zlib.crc32(data, zlib.crc32(tag)) & 0xffffffff
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', crc)
+
+
+def _color_type(mode):
+    try:
+        return COLOR_TYPES[mode]
+    except KeyError:
+        raise ValueError(f"Unsupported PNG mode: {mode}") from None
+
+
+def _header(width, height, mode):
+    color_type, _ = _color_type(mode)
+    yield PNG_SIGNATURE
+    yield chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+
+
+def idat_chunks(pieces, chunk_size=IDAT_CHUNK_SIZE):
+    """Re-slice a stream of compressed data into fixed-size IDAT chunks"""
+    pending = bytearray()
+    for piece in pieces:
+        pending += piece
+        while len(pending) >= chunk_size:
+            yield chunk(b'IDAT', bytes(pending[:chunk_size]))
+            del pending[:chunk_size]
+    if pending:
+        yield chunk(b'IDAT', bytes(pending))
+
+
+def _compress_rows(rows, row_size, height, bpp, options):
+    compressor = zlib.compressobj(options.level, zlib.DEFLATED, zlib.MAX_WBITS,
+                                  zlib.DEF_MEM_LEVEL, options.strategy)
+    # Filter byte followed by the row, reused for every scanline
+    scanline = bytearray(1 + row_size)
+    view = memoryview(scanline)
+    prev = bytes(row_size)
+    fixed_type = None if options.filter == 'adaptive' else FILTER_TYPES[options.filter]
+    count = 0
+    for row in rows:
+        if len(row) != row_size:
+            raise ValueError(f"Row {count} has {len(row)} bytes, expected {row_size}")
+        if fixed_type == NONE:
+            scanline[0] = NONE
+            view[1:] = row
+        elif fixed_type is None:
+            scanline[0], view[1:] = adaptive_filter_row(row, prev, bpp)
+        else:
+            scanline[0] = fixed_type
+            view[1:] = filter_row(fixed_type, row, prev, bpp)
+        yield compressor.compress(scanline)
+        if fixed_type != NONE:
+            prev = bytes(row)
+        count += 1
+    if count != height:
+        raise ValueError(f"Got {count} rows, expected {height}")
+    yield compressor.flush()
+
+
+def iter_png(width, height, rows, mode='RGB', options=None):
+    """Yield the PNG file piece by piece from an iterable of raw scanlines
+
+    Each row must be ``width * channels`` bytes (any bytes-like object).
+    ``options`` is an EncoderOptions or a profile name.
+    """
+    options = encoder_options(options)
+    _, channels = _color_type(mode)
+    yield from _header(width, height, mode)
+    yield from idat_chunks(_compress_rows(rows, width * channels, height, channels, options))
+    yield chunk(b'IEND')
+
+
+def _deflate_raw(data, options, mode):
+    deflater = zlib.compressobj(options.level, zlib.DEFLATED, -zlib.MAX_WBITS,
+                                zlib.DEF_MEM_LEVEL, options.strategy)
+    return deflater.compress(data) + deflater.flush(mode)
+
+
+def _compress_solid(first, scanline, height, options):
+    """zlib stream for ``first`` then ``height - 1`` copies of ``scanline``
+
+    Runs in O(height / block) steps: one block of repeated scanlines is
+    deflated once, ending with a full flush so it carries no
+    back-references, and that compressed pattern is emitted once per block.
+    Only the Adler-32 checksum touches every byte.
+    """
+    rows_per_block = max(1, SOLID_BLOCK_SIZE // len(scanline))
+    full_blocks, tail_rows = divmod(height - 1, rows_per_block)
+    block = scanline * rows_per_block
+
+    yield ZLIB_HEADER
+    yield _deflate_raw(first, options, zlib.Z_FULL_FLUSH)
+    adler = zlib.adler32(first)
+    if full_blocks:
+        pattern = _deflate_raw(block, options, zlib.Z_FULL_FLUSH)
+        for _ in range(full_blocks):
+            yield pattern
+            adler = zlib.adler32(block, adler)
+
+    tail = scanline * tail_rows
+    yield _deflate_raw(tail, options, zlib.Z_FINISH)
+    adler = zlib.adler32(tail, adler)
+    yield struct.pack('>I', adler & 0xffffffff)
+
+
+def iter_solid_png(width, height, color, options=None):
+    """Yield a single-color PNG; ``color`` is an RGB or RGBA tuple"""
+    options = encoder_options(options)
+    mode = 'RGBA' if len(color) == 4 else 'RGB'
+    yield from _header(width, height, mode)
+    row = bytes(color) * width
+    if options.filter == 'none':
+        first = scanline = bytes([NONE]) + row
+    else:
+        # Sub leaves one pixel of data in the first row; Up zeroes every other row
+        bpp = len(color)
+        first = bytes([SUB]) + filter_row(SUB, row, bytes(len(row)), bpp)
+        scanline = bytes([UP]) + bytes(len(row))
+    yield from idat_chunks(_compress_solid(first, scanline, height, options))
+    yield chunk(b'IEND')
+
+
+def encode_solid(width, height, color, options=None):
+    """Encode a single-color PNG to bytes"""
+    return b''.join(iter_solid_png(width, height, color, options))
+
+
+def encode_png(width, height, rows, mode='RGB', options=None):
+    """Encode scanlines to PNG bytes"""
+    return b''.join(iter_png(width, height, rows, mode, options))
+
+
+def write_png(path, width, height, rows, mode='RGB', options=None):
+    """Stream scanlines into a PNG file; returns the number of bytes written"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    written = 0
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        for piece in iter_png(width, height, rows, mode, options):
+            f.write(piece)
+            written += len(piece)
+    os.replace(tmp_path, path)
+    return written
+
+
+def solid_rows(width, height, color):
+    """Rows of a single color; ``color`` is an RGB or RGBA tuple"""
+    row = bytes(color) * width
+    return itertools.repeat(row, height)
+
+
+def array_rows(pixels):
+    """Rows of a NumPy ``(height, width, channels)`` uint8 array"""
+    for row in pixels:
+        yield row.tobytes()
+
+
+def encode_array(pixels, options=None):
+    """Encode a NumPy uint8 array of shape (height, width, 3 or 4)"""
+    height, width, channels = pixels.shape
+    mode = 'RGBA' if channels == 4 else 'RGB'
+    return encode_png(width, height, array_rows(pixels), mode, options)
+
+
+def encoder_options(options=None):
+    """Resolve a profile name or EncoderOptions (None = "default")"""
+    if options is None:
+        return PROFILES[DEFAULT_PROFILE]
+    if isinstance(options, str):
+        try:
+            return PROFILES[options]
+        except KeyError:
+            raise ValueError(f"Unknown encoder profile: {options}") from None
+    if options.filter != 'adaptive' and options.filter not in FILTER_TYPES:
+        raise ValueError(f"Unknown PNG filter: {options.filter}")
+    return options
+
+
+def pillow_save_options(profile=None):
+    """Keyword arguments for ``Image.save(..., 'PNG')`` matching a profile
+
+    Pillow always filters adaptively; the profile picks the zlib level.
+    """
+    profile = profile or DEFAULT_PROFILE
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown encoder profile: {profile}")
+    if profile == 'smallest':
+        return {'optimize': True}
+    return {'compress_level': PROFILES[profile].level}
+
+
+def options_from_pillow(options):
+    """EncoderOptions equivalent to Pillow PNG save options
+
+    The inverse of pillow_save_options, for encoding the same request
+    with this module; filtering is adaptive like Pillow's.
+    """
+    if options.get('optimize'):
+        return PROFILES['smallest']
+    level = options.get('compress_level', PROFILES[DEFAULT_PROFILE].level)
+    return EncoderOptions('adaptive', level, zlib.Z_DEFAULT_STRATEGY)
+
+
+def add_profile_argument(parser):
+    """Register the shared ``--profile`` option on an argparse parser"""
+    parser.add_argument('--profile', choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                        help='PNG encoding profile: fast for dev builds, smallest for store assets')
+    return parser
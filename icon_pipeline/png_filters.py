@@ -0,0 +1,105 @@
+"""
+PNG scanline filters (None, Sub, Up, Average, Paeth) and adaptive selection.
+
+Adaptive mode tries every filter on each row and keeps the one with the
+smallest sum of absolute values of the filtered bytes read as signed, the
+heuristic recommended by the PNG specification. NumPy is used when it is
+installed; otherwise the filters run in pure Python. It is imported on the
+first filtered row, not at import time.
+"""
+
+from icon_pipeline import backends
+
+NONE, SUB, UP, AVERAGE, PAETH = range(5)
+
+FILTER_TYPES = {
+    'none': NONE,
+    'sub': SUB,
+    'up': UP,
+    'average': AVERAGE,
+    'paeth': PAETH,
+}
+
+
+def _paeth_predictor(a, b, c):
+    p = a + b - c
+    pa = abs(p - a)
+    pb = abs(p - b)
+    pc = abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    if pb <= pc:
+        return b
+    return c
+
+
+def _filter_python(filter_type, row, prev, bpp):
+    if filter_type == NONE:
+        return bytes(row)
+    n = len(row)
+    left = bytes(bpp) + bytes(row[:n - bpp])
+    if filter_type == SUB:
+        return bytes((x - a) & 0xff for x, a in zip(row, left))
+    if filter_type == UP:
+        return bytes((x - b) & 0xff for x, b in zip(row, prev))
+    if filter_type == AVERAGE:
+        return bytes((x - ((a + b) >> 1)) & 0xff for x, a, b in zip(row, left, prev))
+    upper_left = bytes(bpp) + bytes(prev[:n - bpp])
+    return bytes((x - _paeth_predictor(a, b, c)) & 0xff
+                 for x, a, b, c in zip(row, left, prev, upper_left))
+
+
+def _cost_python(filtered):
+    return sum(v if v < 128 else 256 - v for v in filtered)
+
+
+def _filter_numpy(np, filter_type, row, prev, bpp):
+    x = np.frombuffer(row, dtype=np.uint8).astype(np.int16)
+    if filter_type == NONE:
+        return x
+    b = np.frombuffer(prev, dtype=np.uint8).astype(np.int16)
+    a = np.zeros_like(x)
+    a[bpp:] = x[:-bpp]
+    if filter_type == SUB:
+        return x - a
+    if filter_type == UP:
+        return x - b
+    if filter_type == AVERAGE:
+        return x - ((a + b) >> 1)
+    c = np.zeros_like(x)
+    c[bpp:] = b[:-bpp]
+    pa = np.abs(b - c)
+    pb = np.abs(a - c)
+    pc = np.abs(a + b - 2 * c)
+    predictor = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+    return x - predictor
+
+
+def filter_row(filter_type, row, prev, bpp):
+    """Return ``row`` filtered with ``filter_type``, as bytes"""
+    np = backends.optional("numpy")
+    if np is not None:
+        return (_filter_numpy(np, filter_type, row, prev, bpp) & 0xff).astype(np.uint8).tobytes()
+    return _filter_python(filter_type, row, prev, bpp)
+
+
+def adaptive_filter_row(row, prev, bpp):
+    """Pick the filter with the minimum sum of absolute signed bytes
+
+    Returns ``(filter_type, filtered_bytes)``.
+    """
+    np = backends.optional("numpy")
+    best = None
+    for filter_type in (NONE, SUB, UP, AVERAGE, PAETH):
+        if np is not None:
+            filtered = _filter_numpy(np, filter_type, row, prev, bpp) & 0xff
+            cost = int(np.minimum(filtered, 256 - filtered).sum())
+        else:
+            filtered = _filter_python(filter_type, row, prev, bpp)
+            cost = _cost_python(filtered)
+        if best is None or cost < best[0]:
+            best = (cost, filter_type, filtered)
+    _, filter_type, filtered = best
+    if np is not None:
+        filtered = filtered.astype(np.uint8).tobytes()
+    return filter_type, filtered
@@ -0,0 +1,202 @@
+"""
+Opt-in cProfile and tracemalloc hooks shared by every entry point.
+
+Each script's ``__main__`` block calls ``profiling.run(main)``. That
+removes these options from the command line before the script parses
+its own:
+
+  --cprofile             profile with cProfile, writing <script>.pstats
+                          and printing the top functions
+  --cprofile-out PATH     write the cProfile stats to PATH instead
+  --trace-alloc           trace Python allocations with tracemalloc,
+                          writing the top allocation sites to
+                          <script>.alloc.txt
+  --trace-alloc-out PATH  write the allocation report to PATH instead
+  --profile-size N        only profile the work for targets of N pixels
+
+``--profile`` already selects the PNG encoder profile, hence the
+different names. Output paths are separate options, so a switch never
+takes the next word on the command line (e.g. a subcommand) as its path. With ``--profile-size``, only the blocks that scripts
+mark with ``profiling.target(size)`` are measured, and the allocation
+report lists what each matching block allocated and kept. Pool workers
+are not profiled, so ``parallel.run_tasks`` runs serially while a
+session is active.
+"""
+
+import argparse
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 5
+
+_session = None
+
+
+def _snapshot():
+    """Traced allocations, without the ones made by tracemalloc itself"""
+    import tracemalloc
+
+    return tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),))
+
+
+def _ensure_parent(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+class Session:
+    """One profiling run: a cProfile profiler and/or tracemalloc blocks"""
+
+    def __init__(self, cprofile_path=None, alloc_path=None, size=None):
+        self.cprofile_path = cprofile_path
+        self.alloc_path = alloc_path
+        self.size = size
+        self.profiler = None
+        # (label, peak traced bytes, [StatisticDiff]) per measured block
+        self.blocks = []
+        self.measured = 0
+        self._depth = 0
+        self._snapshot = None
+
+    def start(self):
+        if self.cprofile_path:
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+        if self.alloc_path:
+            import tracemalloc
+
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    @contextmanager
+    def block(self, label):
+        """Measure the enclosed work; nested blocks join the outer one"""
+        self._depth += 1
+        if self._depth > 1:
+            try:
+                yield
+            finally:
+                self._depth -= 1
+            return
+        self.measured += 1
+        if self.alloc_path:
+            import tracemalloc
+
+            tracemalloc.reset_peak()
+            self._snapshot = _snapshot()
+        if self.profiler:
+            self.profiler.enable()
+        try:
+            yield
+        finally:
+            if self.profiler:
+                self.profiler.disable()
+            if self.alloc_path:
+                import tracemalloc
+
+                _, peak = tracemalloc.get_traced_memory()
+                diff = _snapshot().compare_to(self._snapshot, 'lineno')
+                self.blocks.append((label, peak, [stat for stat in diff if stat.size_diff > 0]))
+                self._snapshot = None
+            self._depth -= 1
+
+    def finish(self):
+        if self.alloc_path:
+            import tracemalloc
+
+            tracemalloc.stop()
+        if not self.measured:
+            print(f"⚠️  Profiling: no target of {self.size}px was rendered")
+            return
+        if self.profiler:
+            self._report_cprofile()
+        if self.alloc_path:
+            self._report_allocations()
+
+    def _report_cprofile(self):
+        import pstats
+
+        _ensure_parent(self.cprofile_path)
+        self.profiler.dump_stats(self.cprofile_path)
+        print(f"\n🔬 cProfile: {self.cprofile_path} (top {TOP_FUNCTIONS} by cumulative time)")
+        stats = pstats.Stats(self.profiler, stream=sys.stdout)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+
+    def _report_allocations(self):
+        lines = []
+        for label, peak, stats in self.blocks:
+            lines.append(f"{label}: peak traced {peak / 1024:.1f} KiB, "
+                         f"{sum(stat.size_diff for stat in stats) / 1024:.1f} KiB kept")
+            for stat in stats[:TOP_ALLOCATIONS]:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size_diff / 1024:10.1f} KiB {stat.count_diff:+8d} blocks  "
+                             f"{frame.filename}:{frame.lineno}")
+            lines.append("")
+        _ensure_parent(self.alloc_path)
+        with open(self.alloc_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+        print(f"\n🧠 tracemalloc: {self.alloc_path}")
+        for line in lines[:12]:
+            print(f"   {line}")
+
+
+def active():
+    """Whether a profiling session is running in this process"""
+    return _session is not None
+
+
+@contextmanager
+def target(size):
+    """Mark the work for one target size, for ``--profile-size``"""
+    if _session is None or _session.size is None or _session.size != size:
+        yield
+        return
+    with _session.block(f"{size}x{size}"):
+        yield
+
+
+def parser():
+    """Parser of the profiling options"""
+    options = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    options.add_argument('--cprofile', action='store_true')
+    options.add_argument('--cprofile-out', metavar='PATH')
+    options.add_argument('--trace-alloc', action='store_true')
+    options.add_argument('--trace-alloc-out', metavar='PATH')
+    options.add_argument('--profile-size', type=int, metavar='N')
+    return options
+
+
+def run(main, argv=None):
+    """Run an entry point's ``main()`` under the profiling options in argv"""
+    global _session
+    argv = sys.argv[1:] if argv is None else list(argv)
+    script_name = os.path.splitext(os.path.basename(sys.argv[0]))[0] or "icons"
+    options, remaining = parser().parse_known_args(argv)
+    # An output path alone also turns its profiler on
+    cprofile_path = options.cprofile_out or (f"{script_name}.pstats" if options.cprofile else None)
+    alloc_path = options.trace_alloc_out or (f"{script_name}.alloc.txt" if options.trace_alloc else None)
+    if not cprofile_path and not alloc_path:
+        if options.profile_size is not None:
+            print("⚠️  --profile-size needs --cprofile or --trace-alloc")
+        sys.argv[1:] = remaining
+        return main()
+
+    sys.argv[1:] = remaining
+    _session = Session(cprofile_path, alloc_path, options.profile_size)
+    _session.start()
+    start = time.perf_counter()
+    try:
+        if options.profile_size is None:
+            with _session.block("whole run"):
+                return main()
+        return main()
+    finally:
+        print(f"\n⏱️  Profiled run: {time.perf_counter() - start:.2f} s")
+        session, _session = _session, None
+        session.finish()
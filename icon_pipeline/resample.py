@@ -0,0 +1,96 @@
+"""
+Mipmap-pyramid downscaling.
+
+Instead of running LANCZOS over the full-resolution source for every
+target, the source is halved repeatedly with ``Image.reduce(2)`` (a box
+filter) and each target is produced by a single LANCZOS step from the
+smallest pyramid level that is still at least ``MIN_FINAL_RATIO`` times
+larger. Levels are built lazily and shared by all targets of a source.
+"""
+
+import weakref
+
+# The final LANCZOS step always reduces by at least this factor, which
+# keeps its quality indistinguishable from a direct resize
+MIN_FINAL_RATIO = 2
+
+# quality_check floor, the same as the optimize stage's: above it the
+# pyramid counts as equivalent to a direct LANCZOS resize (checked by
+# benchmark_icons.py)
+MIN_PSNR = 40.0
+
+# Identifies this resampling scheme in build cache keys
+METHOD = f"pyramid-lanczos/{MIN_FINAL_RATIO}"
+
+
+class Pyramid:
+    """Lazily built 2x reduction levels of one image
+
+    Only the reductions are held; the source image is referenced weakly,
+    so a pyramid never keeps its source alive.
+    """
+
+    def __init__(self, img):
+        self._source = weakref.ref(img)
+        self.levels = []
+
+    def level_for(self, width, height):
+        """Smallest level at least MIN_FINAL_RATIO times the target size"""
+        level = self._source()
+        index = 0
+        while True:
+            if (level.width // 2 < width * MIN_FINAL_RATIO
+                    or level.height // 2 < height * MIN_FINAL_RATIO):
+                return level
+            if index == len(self.levels):
+                self.levels.append(level.reduce(2))
+            level = self.levels[index]
+            index += 1
+
+    def resize(self, size):
+        """Resize to ``size`` (width, height) from the nearest pyramid level"""
+        from PIL import Image
+
+        width, height = size
+        level = self.level_for(width, height)
+        if level.size == (width, height):
+            return level.copy()
+        return level.resize((width, height), Image.Resampling.LANCZOS)
+
+
+# id(image) -> pyramid of that image while it is alive. PIL images are
+# unhashable, so a WeakKeyDictionary cannot be used; entries are removed
+# when their image is freed, before its id can be reused.
+_pyramids = {}
+
+
+def _forget(key, source):
+    entry = _pyramids.get(key)
+    if entry is not None and entry._source is source:
+        del _pyramids[key]
+
+
+def pyramid(img):
+    """Shared pyramid for ``img``, dropped when the image is freed"""
+    key = id(img)
+    result = _pyramids.get(key)
+    if result is not None and result._source() is img:
+        return result
+    result = Pyramid(img)
+    weakref.finalize(img, _forget, key, result._source)
+    _pyramids[key] = result
+    return result
+
+
+def resize(img, size):
+    """Drop-in replacement for ``img.resize(size, LANCZOS)`` using the pyramid"""
+    return pyramid(img).resize(size)
+
+
+def quality_check(img, size):
+    """PSNR (dB) of the pyramid result against a direct LANCZOS resize"""
+    from PIL import Image
+    from icon_pipeline.optimize import psnr
+
+    direct = img.resize(size, Image.Resampling.LANCZOS)
+    return psnr(direct, resize(img, size))
@@ -0,0 +1,64 @@
+"""
+Decoded source-image cache.
+
+Source logos are decoded and converted to RGBA once per process and shared
+by every target rendered from them. Cached images are shared: callers may
+resize or paste from them but must not modify them in place.
+"""
+
+import os
+from functools import lru_cache
+
+from icon_pipeline import trace
+
+
+@lru_cache(maxsize=8)
+def _decode(path, mtime_ns, file_size):
+    from PIL import Image
+
+    with trace.stage("decode"), Image.open(path) as img:
+        img.load()
+        return img.convert('RGBA') if img.mode != 'RGBA' else img.copy()
+
+
+def _stat_key(path):
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def load_rgba(path):
+    """Decoded RGBA image for ``path``; re-decoded only when the file changes"""
+    return _decode(*_stat_key(path))
+
+
+@lru_cache(maxsize=8)
+def _square(path, mtime_ns, file_size):
+    from PIL import Image
+
+    img = _decode(path, mtime_ns, file_size)
+    if img.width == img.height:
+        return img
+    size = max(img.size)
+    with trace.stage("composite"):
+        square = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        square.paste(img, ((size - img.width) // 2, (size - img.height) // 2), img)
+    return square
+
+
+def load_square(path):
+    """Decoded RGBA image centered on a transparent square canvas"""
+    return _square(*_stat_key(path))
+
+
+def as_rgba(source):
+    """Accept a path or an already-decoded image and return an RGBA image"""
+    if isinstance(source, (str, os.PathLike)):
+        return load_rgba(source)
+    return source.convert('RGBA') if source.mode != 'RGBA' else source
+
+
+def clear():
+    """Drop every cached decode (e.g. to free memory between batches)"""
+    _decode.cache_clear()
+    _square.cache_clear()
@@ -0,0 +1,78 @@
+"""
+SVG rasterization with cached master renders.
+
+The SVG is read once per run; a few master resolutions are rendered on
+demand and every smaller target is derived from the nearest master with
+a LANCZOS downscale instead of another full rasterization. Both steps go
+through the backends chosen by icon_pipeline.operations.
+"""
+
+import os
+from functools import lru_cache
+
+from icon_pipeline import operations
+
+# Master resolutions, largest first. Targets above the largest master are
+# always rendered exactly.
+MASTER_SIZES = (1024, 512, 256, 128)
+
+
+class SvgRenderer:
+    """Render one SVG document at many sizes, reusing master bitmaps"""
+
+    def __init__(self, svg_path, master_sizes=MASTER_SIZES, exact_sizes=()):
+        self.svg_path = svg_path
+        with open(svg_path, 'rb') as f:
+            self.svg_data = f.read()
+        self.master_sizes = tuple(sorted(master_sizes, reverse=True))
+        # Sizes where hinting matters and a downscale is not good enough
+        self.exact_sizes = frozenset(exact_sizes)
+        self._masters = {}
+
+    def _rasterize(self, size):
+        """Rasterize the in-memory SVG at ``size`` pixels"""
+        return operations.rasterize(self.svg_data, size, url=self.svg_path)
+
+    def master(self, size):
+        """Return the cached master bitmap for a master size"""
+        img = self._masters.get(size)
+        if img is None:
+            img = self._rasterize(size)
+            self._masters[size] = img
+        return img
+
+    def nearest_master(self, size):
+        """Smallest master that is still at least ``size`` pixels, or None"""
+        candidates = [m for m in self.master_sizes if m >= size]
+        return min(candidates) if candidates else None
+
+    def render(self, size, exact=False):
+        """Return an RGBA image of ``size`` x ``size`` pixels"""
+        if exact or size in self.exact_sizes:
+            return self._rasterize(size)
+
+        master_size = self.nearest_master(size)
+        if master_size is None:
+            return self._rasterize(size)
+
+        master = self.master(master_size)
+        if master_size == size:
+            return master.copy()
+        return operations.resize(master, (size, size))
+
+
+@lru_cache(maxsize=8)
+def _cached_renderer(svg_path, mtime_ns, file_size):
+    return SvgRenderer(svg_path)
+
+
+def get_svg_renderer(svg_path):
+    """Shared renderer for ``svg_path``; refreshed when the file changes"""
+    svg_path = os.path.abspath(svg_path)
+    stat = os.stat(svg_path)
+    return _cached_renderer(svg_path, stat.st_mtime_ns, stat.st_size)
+
+
+def clear():
+    """Drop the cached renderers and their master bitmaps"""
+    _cached_renderer.cache_clear()
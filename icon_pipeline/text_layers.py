@@ -0,0 +1,67 @@
+"""
+Cached text masks for icon generators.
+
+Icons draw the same few strings ("R", "VC", "RC") at every target size.
+Each (string, font, size) is rasterized once into an ``L`` mask cropped to
+its ink, together with its bounding box, and composited in any color.
+Very small sizes are scaled down from a larger cached mask, which stays
+legible where hinted rendering at a handful of pixels breaks apart.
+"""
+
+from functools import lru_cache
+
+from PIL import Image, ImageDraw
+
+from icon_pipeline import resample
+from icon_pipeline.fonts import DEFAULT_FAMILY, get_font
+
+# Text below this pixel size is downscaled from a mask of this size
+SMALL_TEXT_SIZE = 16
+REFERENCE_TEXT_SIZE = 64
+
+# Masks kept per process
+TEXT_CACHE_SIZE = 256
+
+
+def _measure(text, font):
+    return ImageDraw.Draw(Image.new('L', (1, 1))).textbbox((0, 0), text, font=font)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def text_mask(text, size, family=DEFAULT_FAMILY, style="Regular"):
+    """(mask, bbox) of ``text``; ``bbox`` matches ``ImageDraw.textbbox((0, 0))``
+
+    The mask covers exactly ``bbox``. Callers must not modify it.
+    """
+    if size < SMALL_TEXT_SIZE:
+        reference, (left, top, right, bottom) = text_mask(text, REFERENCE_TEXT_SIZE, family, style)
+        scale = size / REFERENCE_TEXT_SIZE
+        bbox = (round(left * scale), round(top * scale), round(right * scale), round(bottom * scale))
+        width, height = max(1, bbox[2] - bbox[0]), max(1, bbox[3] - bbox[1])
+        return resample.resize(reference, (width, height)), bbox
+
+    font = get_font(size, family, style)
+    bbox = _measure(text, font)
+    mask = Image.new('L', (max(1, bbox[2] - bbox[0]), max(1, bbox[3] - bbox[1])), 0)
+    ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), text, font=font, fill=255)
+    return mask, bbox
+
+
+def text_bbox(text, size, family=DEFAULT_FAMILY, style="Regular"):
+    """Bounding box of ``text`` drawn at the origin, memoized with its mask"""
+    return text_mask(text, size, family, style)[1]
+
+
+def draw_text(img, xy, text, size, fill, family=DEFAULT_FAMILY, style="Regular"):
+    """Composite cached ``text`` onto ``img`` as ``ImageDraw.text(xy)`` would place it"""
+    mask, bbox = text_mask(text, size, family, style)
+    img.paste(fill, (xy[0] + bbox[0], xy[1] + bbox[1]), mask)
+    return img
+
+
+def draw_centered_text(img, text, size, fill, offset=(0, 0), family=DEFAULT_FAMILY, style="Regular"):
+    """Center ``text`` on ``img`` (shifted by ``offset``) using its bounding box size"""
+    left, top, right, bottom = text_bbox(text, size, family, style)
+    x = (img.width - (right - left)) // 2 + offset[0]
+    y = (img.height - (bottom - top)) // 2 + offset[1]
+    return draw_text(img, (x, y), text, size, fill, family, style)
@@ -0,0 +1,216 @@
+"""
+Per-output stage timing and memory instrumentation.
+
+While tracing is enabled, every output file gets a record of the time
+spent in each pipeline stage (decode, rasterize, resize, composite,
+encode, write), the bytes written, and the process's peak RSS while the
+output was produced. Work shared by several outputs is charged to the
+output that triggered it. A render written to many paths therefore
+carries its full cost on the first path, and the others only pay for
+their write. Stages are timed exclusively: time spent in a nested stage
+is not counted again in the enclosing one.
+
+Records are collected per process and shipped back from pool workers by
+``parallel.run_tasks``. They are written as a JSON or CSV trace, and a
+summary lists the stage totals and the slowest outputs. Tracing is off
+by default and then costs one flag check per stage.
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+STAGES = ("decode", "rasterize", "resize", "composite", "encode", "write")
+
+# Inherited by worker processes, so tracing follows the work into the pool
+ENV_VAR = "ICON_TRACE"
+
+DEFAULT_SLOWEST = 10
+
+_enabled = os.environ.get(ENV_VAR) == "1"
+_records = []
+# Record of the output being produced, and the stack of running stages as
+# [name, start time] pairs
+_current = None
+_stack = []
+
+
+def enable():
+    """Start recording in this process and in workers started afterwards"""
+    global _enabled
+    _enabled = True
+    os.environ[ENV_VAR] = "1"
+
+
+def enabled():
+    return _enabled
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, or None"""
+    # VmHWM restarts at exec; ru_maxrss would carry over the parent's peak
+    # from the fork that preceded it
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _reset_peak_rss():
+    """Restart the RSS high-water mark at the current RSS (Linux 4.0+)"""
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+            f.write('5')
+    except OSError:
+        pass  # the peak then covers everything since the process started
+
+
+def _new_record(path):
+    return {"path": path, "pid": os.getpid(), "stages": dict.fromkeys(STAGES, 0.0),
+            "bytes": 0, "peak_rss": None, "total": 0.0}
+
+
+@contextmanager
+def output(path):
+    """Attribute the stages run inside this block to output ``path``"""
+    global _current
+    if not _enabled:
+        yield
+        return
+    previous = _current
+    record = _current = _new_record(path)
+    _reset_peak_rss()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record["total"] = time.perf_counter() - start
+        record["peak_rss"] = peak_rss()
+        _records.append(record)
+        _current = previous
+
+
+@contextmanager
+def stage(name):
+    """Time a pipeline stage for the current output"""
+    if not _enabled or _current is None:
+        yield
+        return
+    record = _current
+    now = time.perf_counter()
+    if _stack:
+        outer = _stack[-1]
+        record["stages"][outer[0]] += now - outer[1]
+    entry = [name, now]
+    _stack.append(entry)
+    try:
+        yield
+    finally:
+        now = time.perf_counter()
+        record["stages"][name] = record["stages"].get(name, 0.0) + now - entry[1]
+        _stack.pop()
+        if _stack:
+            _stack[-1][1] = now
+
+
+def add_bytes(count):
+    """Count bytes written for the current output"""
+    if _enabled and _current is not None:
+        _current["bytes"] += count
+
+
+def drain():
+    """Remove and return the records collected in this process"""
+    records = list(_records)
+    del _records[:]
+    return records
+
+
+def extend(records):
+    """Add records collected by a worker process"""
+    _records.extend(records)
+
+
+def records():
+    return list(_records)
+
+
+def write(path, trace_records=None):
+    """Write records as CSV when ``path`` ends in .csv, JSON otherwise"""
+    trace_records = records() if trace_records is None else trace_records
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            writer = csv.writer(f)
+            writer.writerow(["path", "pid", "total_ms"] + [f"{name}_ms" for name in STAGES]
+                            + ["bytes", "peak_rss"])
+            for record in trace_records:
+                writer.writerow([record["path"], record["pid"], f"{record['total'] * 1000:.3f}"]
+                                + [f"{record['stages'].get(name, 0.0) * 1000:.3f}" for name in STAGES]
+                                + [record["bytes"], record["peak_rss"]])
+        else:
+            json.dump({"stages": STAGES, "outputs": trace_records}, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def summary(trace_records=None, slowest=DEFAULT_SLOWEST):
+    """Print stage totals and the slowest outputs"""
+    trace_records = records() if trace_records is None else trace_records
+    if not trace_records:
+        print("📊 Trace: no outputs were produced")
+        return
+    totals = {name: sum(record["stages"].get(name, 0.0) for record in trace_records)
+              for name in STAGES}
+    staged = sum(totals.values()) or 1.0
+    written = sum(record["bytes"] for record in trace_records)
+    peaks = [record["peak_rss"] for record in trace_records if record["peak_rss"]]
+
+    print(f"\n📊 Trace: {len(trace_records)} outputs, {written / 1024:.1f} KB written"
+          + (f", peak RSS {max(peaks) / (1024 * 1024):.1f} MB" if peaks else ""))
+    for name, seconds in sorted(totals.items(), key=lambda item: -item[1]):
+        if seconds:
+            print(f"   {name:<10} {seconds * 1000:9.1f} ms  {seconds / staged * 100:5.1f}%")
+
+    print(f"🐢 Slowest {min(slowest, len(trace_records))} outputs:")
+    for record in sorted(trace_records, key=lambda r: -r["total"])[:slowest]:
+        top = max(record["stages"], key=record["stages"].get)
+        print(f"   {record['total'] * 1000:8.1f} ms  {record['path']}  "
+              f"(mostly {top}: {record['stages'][top] * 1000:.1f} ms)")
+
+
+def add_trace_argument(parser):
+    """Register the shared ``--trace`` option on an argparse parser"""
+    parser.add_argument('--trace', metavar='PATH',
+                        help='record per-output stage timings to PATH (.json or .csv) '
+                             'and print the slowest outputs')
+    return parser
+
+
+def start(args):
+    """Enable tracing when ``--trace`` was given"""
+    if getattr(args, 'trace', None):
+        enable()
+
+
+def finish(args):
+    """Write the trace file and the summary when ``--trace`` was given"""
+    if getattr(args, 'trace', None):
+        write(args.trace)
+        summary()
+        print(f"💾 Trace: {args.trace}")
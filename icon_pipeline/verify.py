@@ -0,0 +1,107 @@
+"""
+Check generated icons against the manifest without rebuilding them.
+
+Targets must be PNG files of the planned pixel size. Containers must be
+well-formed ICO/ICNS files holding the planned sizes. Metadata files
+must match what platform_metadata would write now. Only headers are
+read, so verifying a full tree takes milliseconds.
+"""
+
+import os
+import struct
+
+from icon_pipeline import platform_metadata
+from icon_pipeline.containers import ICNS_TYPES
+from icon_pipeline.png_encoder import PNG_SIGNATURE
+
+
+def _png_size(path):
+    """(width, height) from the IHDR chunk, or None when not a PNG"""
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if len(header) < 24 or not header.startswith(PNG_SIGNATURE) or header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+
+def check_target(target):
+    """Problems with one manifest Target, as messages"""
+    if not os.path.exists(target.path):
+        return [f"{target.path}: missing"]
+    size = _png_size(target.path)
+    if size is None:
+        return [f"{target.path}: not a PNG file"]
+    if size != (target.size, target.size):
+        return [f"{target.path}: {size[0]}x{size[1]}, expected {target.size}x{target.size}"]
+    return []
+
+
+def _ico_sizes(data):
+    reserved, kind, count = struct.unpack_from('<HHH', data, 0)
+    if reserved != 0 or kind != 1 or len(data) < 6 + 16 * count:
+        return None
+    sizes = []
+    for index in range(count):
+        width, height, _, _, _, _, length, offset = struct.unpack_from('<BBBBHHII', data, 6 + 16 * index)
+        if width != height or offset + length > len(data):
+            return None
+        sizes.append(width or 256)
+    return sizes
+
+
+def _icns_sizes(data):
+    if data[:4] != b'icns' or struct.unpack_from('>I', data, 4)[0] != len(data):
+        return None
+    by_type = {icon_type: size for size, types in ICNS_TYPES.items() for icon_type in types}
+    sizes = set()
+    offset = 8
+    while offset + 8 <= len(data):
+        icon_type, length = data[offset:offset + 4], struct.unpack_from('>I', data, offset + 4)[0]
+        if length < 8 or offset + length > len(data):
+            return None
+        if icon_type in by_type:
+            sizes.add(by_type[icon_type])
+        offset += length
+    return sorted(sizes)
+
+
+def check_container(container):
+    """Problems with one manifest Container, as messages"""
+    if not os.path.exists(container.path):
+        return [f"{container.path}: missing"]
+    with open(container.path, 'rb') as f:
+        data = f.read()
+    try:
+        sizes = _ico_sizes(data) if container.format == "ico" else _icns_sizes(data)
+    except struct.error:
+        sizes = None
+    if sizes is None:
+        return [f"{container.path}: not a valid {container.format.upper()} file"]
+    if sorted(sizes) != sorted(container.sizes):
+        return [f"{container.path}: sizes {sorted(sizes)}, expected {sorted(container.sizes)}"]
+    return []
+
+
+def check_metadata(entry):
+    """Problems with the files of one metadata entry, as messages"""
+    problems = []
+    for path, text in platform_metadata.files(entry).items():
+        if not os.path.exists(path):
+            problems.append(f"{path}: missing")
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() != text:
+                problems.append(f"{path}: out of date")
+    return problems
+
+
+def verify(target_list, containers=(), metadata=()):
+    """Problems found in all targets, containers and metadata entries"""
+    problems = []
+    for target in target_list:
+        problems.extend(check_target(target))
+    for container in containers:
+        problems.extend(check_container(container))
+    for entry in metadata:
+        problems.extend(check_metadata(entry))
+    return problems
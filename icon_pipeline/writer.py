@@ -0,0 +1,181 @@
+"""
+PNG writer that encodes identical bitmaps only once.
+
+Rendered images are keyed by a hash of their pixels and encoder options.
+The first occurrence is encoded and written; every later identical output
+is materialized from that file by reflink or, where the filesystem cannot
+clone, a plain write of the already-encoded bytes. Hardlinks are opt-in
+(ICON_LINK_MODE=hardlink): other icon scripts still write their outputs in
+place, which would silently change every linked copy.
+"""
+
+import hashlib
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from icon_pipeline import trace
+
+# Linux FICLONE ioctl: share extents on copy-on-write filesystems (btrfs, xfs)
+FICLONE = 0x40049409
+
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+
+
+def _ensure_parent(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def _tmp_path(path):
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def write_bytes(path, data):
+    """Atomically write ``data`` to ``path``
+
+    The temporary file is renamed over the target, so an existing hardlink
+    at ``path`` is replaced rather than modified in place.
+    """
+    with trace.stage("write"):
+        _ensure_parent(path)
+        tmp_path = _tmp_path(path)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    trace.add_bytes(len(data))
+
+
+def _reflink(src_path, dst_path):
+    if fcntl is None:
+        raise OSError("reflink is not supported on this platform")
+    tmp_path = _tmp_path(dst_path)
+    try:
+        with open(src_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        os.replace(tmp_path, dst_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _hardlink(src_path, dst_path):
+    if os.path.exists(dst_path) and os.path.samefile(src_path, dst_path):
+        return
+    tmp_path = _tmp_path(dst_path)
+    os.link(src_path, tmp_path)
+    os.replace(tmp_path, dst_path)
+
+
+def materialize(src_path, dst_path, data, mode="auto"):
+    """Make ``dst_path`` a copy of ``src_path`` (whose bytes are ``data``)
+
+    Returns the method used: "reflink", "hardlink" or "copy".
+    """
+    with trace.stage("write"):
+        _ensure_parent(dst_path)
+        if mode in ("auto", "reflink"):
+            try:
+                _reflink(src_path, dst_path)
+                trace.add_bytes(len(data))
+                return "reflink"
+            except OSError:
+                if mode == "reflink":
+                    raise
+        if mode == "hardlink":
+            _hardlink(src_path, dst_path)
+            trace.add_bytes(len(data))
+            return "hardlink"
+    write_bytes(dst_path, data)
+    return "copy"
+
+
+def encode_png(img, **options):
+    """Encode a PIL image to PNG bytes with the selected encode backend"""
+    from icon_pipeline import operations
+
+    return operations.encode(img, **options)
+
+
+def content_key(img, **options):
+    """Hash of the pixels and encoder options that determine the PNG bytes"""
+    h = hashlib.sha256()
+    h.update(repr((img.mode, img.size, sorted(options.items()))).encode('utf-8'))
+    h.update(img.tobytes())
+    return h.hexdigest()
+
+
+class PngWriter:
+    """Write PNGs, encoding each distinct bitmap only once per process"""
+
+    def __init__(self, link_mode="auto"):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Unknown link mode: {link_mode}")
+        self.link_mode = link_mode
+        # content key -> (first written path, encoded bytes)
+        self._written = {}
+        # content key -> (None, encoded bytes) for data not written as a PNG
+        self._encoded = {}
+
+    def encoded(self, img, optimizer=None, **options):
+        """PNG bytes of ``img``, reusing an earlier encode of the same content"""
+        key = content_key(img, optimizer=optimizer, **options)
+        previous = self._written.get(key) or self._encoded.get(key)
+        if previous is not None:
+            return previous[1]
+        data = encode_png(img, **options)
+        if optimizer is not None:
+            from icon_pipeline.optimize import optimize_image
+
+            with trace.stage("encode"):
+                data = min(data, optimize_image(img, optimizer), key=len)
+        self._encoded[key] = (None, data)
+        return data
+
+    def save(self, img, path, optimizer=None, **options):
+        """Write ``img`` to ``path``; returns "encode" or the link method used
+
+        ``optimizer`` (an optimize.OptimizeOptions) runs the palette/zlib
+        optimization stage instead of a single encode and reports the saving.
+        """
+        key = content_key(img, optimizer=optimizer, **options)
+        previous = self._written.get(key)
+        if previous is not None:
+            src_path, data = previous
+            if os.path.exists(src_path):
+                return materialize(src_path, path, data, self.link_mode)
+
+        data = encode_png(img, **options)
+        if optimizer is not None:
+            from icon_pipeline.optimize import optimize_image
+
+            with trace.stage("encode"):
+                optimized = optimize_image(img, optimizer)
+            if len(optimized) < len(data):
+                print(f"🗜️  {path}: {len(data)} -> {len(optimized)} bytes "
+                      f"(saved {len(data) - len(optimized)})")
+                data = optimized
+        write_bytes(path, data)
+        self._written[key] = (path, data)
+        return "encode"
+
+
+_default_writer = None
+
+
+def default_writer():
+    """Process-wide writer shared by the generator scripts"""
+    global _default_writer
+    if _default_writer is None:
+        _default_writer = PngWriter(os.environ.get("ICON_LINK_MODE", "auto"))
+    return _default_writer
+
+
+def save_png(img, path, optimizer=None, **options):
+    """Save through the shared writer"""
+    return default_writer().save(img, path, optimizer=optimizer, **options)
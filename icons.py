@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+REChain VC Lab asset CLI: one process for planning, building and checking icons
+
+  python icons.py build    render every stale icon, container and metadata file
+  python icons.py plan     print the deduplicated render graph without rendering
+  python icons.py verify   check the generated tree against the manifest
+  python icons.py banner   render the Google Play banner (or every variant)
+  python icons.py bench    run the benchmark suite (see benchmark_icons.py)
+  python icons.py watch    rebuild affected icons whenever a source changes
+"""
+
+import argparse
+import os
+import sys
+
+from icon_pipeline import backends, banner, engine, manifest, operations, profiling, trace, verify, watch
+from icon_pipeline.build_cache import BuildCache, add_force_argument
+from icon_pipeline.optimize import add_optimize_arguments, optimize_file, optimize_options
+from icon_pipeline.parallel import add_jobs_argument
+from icon_pipeline.png_encoder import add_profile_argument
+from icon_pipeline.svg_render import MASTER_SIZES
+
+BANNER_OUTPUT = "rechain_vc_lab_google_play_banner_1024x500.png"
+
+def add_selection_arguments(parser):
+    """Which manifest entries to work on and how to render them"""
+    parser.add_argument('--source', choices=sorted(manifest.load_manifest()["sources"]),
+                        help='render every target from this source (default: per manifest)')
+    parser.add_argument('--treatment', choices=sorted(manifest.load_manifest()["treatments"]),
+                        help='padding/background treatment for every target (default: per manifest)')
+    parser.add_argument('--platform', action='append', choices=manifest.PLATFORMS,
+                        help='limit to a platform (repeatable; default: all)')
+    return parser
+
+def select(args):
+    """Targets, containers and metadata entries chosen by the selection options"""
+    targets = manifest.targets(args.platform, source=args.source, treatment=args.treatment)
+    containers = manifest.containers(args.platform, source=args.source, treatment=args.treatment)
+    return targets, containers, manifest.metadata(args.platform)
+
+def _svg_rasterizations(keys):
+    """Master or exact sizes cairosvg will render for SVG render keys"""
+    sizes = set()
+    for key in keys:
+        if not manifest.source_path(key.source).lower().endswith('.svg'):
+            continue
+        params = manifest.treatment(key.treatment)
+        inner = key.size - int(key.size * params["padding"]) * 2
+        masters = [size for size in MASTER_SIZES if size >= inner]
+        sizes.add(min(masters) if masters and not engine.is_exact(key.source, key.size) else inner)
+    return sorted(sizes)
+
+def print_plan(targets, containers, metadata, cache, profile=None, optimize=None):
+    """Print what a build would do; returns the number of stale outputs"""
+    entries = engine.plan(targets, cache, profile, optimize, containers)
+    groups = list(manifest.group_renders(targets))
+    print(f"🧩 {len(targets)} targets -> {len(groups)} unique renders, "
+          f"{len(containers)} containers, {len(metadata)} metadata entries")
+
+    stale_keys = set()
+    stale_outputs = 0
+    for index, (outputs, key, _) in enumerate(entries):
+        paths = (outputs,) if isinstance(outputs, str) else outputs
+        fresh = all(cache.is_fresh(path, key) for path in paths)
+        state = "✅ fresh" if fresh else "🔨 stale"
+        if index < len(groups):
+            render = groups[index]
+            more = f" (+{len(paths) - 1} linked)" if len(paths) > 1 else ""
+            print(f"   {state}  {render.source:<8} {render.size:>5}px {render.treatment:<7} {paths[0]}{more}")
+            needed = [render]
+        else:
+            container = containers[index - len(groups)]
+            print(f"   {state}  {container.format.upper():<8} {', '.join(map(str, container.sizes))}  {container.path}")
+            needed = [manifest.RenderKey(container.source, size, container.treatment)
+                      for size in container.sizes]
+        if not fresh:
+            stale_keys.update(needed)
+            stale_outputs += len(paths)
+
+    for entry in metadata:
+        for problem in verify.check_metadata(entry):
+            print(f"   📝 will update  {problem}")
+
+    megapixels = sum(key.size * key.size for key in stale_keys) / 1e6
+    rasterizations = _svg_rasterizations(stale_keys)
+    print(f"🔢 Work: {stale_outputs} stale outputs from {len(stale_keys)} renders "
+          f"({megapixels:.2f} MP to resize and encode)")
+    if rasterizations:
+        print(f"   SVG rasterizations: {', '.join(map(str, rasterizations))}px")
+    return stale_outputs
+
+def cmd_build(args):
+    targets, containers, metadata = select(args)
+    cache = BuildCache(force=args.force)
+    if args.dry_run:
+        print_plan(targets, containers, metadata, cache, args.profile, optimize_options(args))
+        return 0
+    built, skipped, failed = engine.build(targets, cache, jobs=args.jobs, profile=args.profile,
+                                          optimize=optimize_options(args), containers=containers,
+                                          metadata=metadata)
+    if args.banners:
+        # Same process: fonts, Pillow and the worker pool are already warm
+        variants = banner.load_variants(args.banners)
+        paths = banner.build_banners(variants, args.banner_dir, profile=args.profile, jobs=args.jobs)
+        failed += len(variants) - len(paths)
+    print(f"\n📊 Built {built}, up to date {skipped}, failed {failed}")
+    return 1 if failed else 0
+
+def cmd_plan(args):
+    targets, containers, metadata = select(args)
+    print_plan(targets, containers, metadata, BuildCache(), args.profile, optimize_options(args))
+    return 0
+
+def cmd_verify(args):
+    targets, containers, metadata = select(args)
+    problems = verify.verify(targets, containers, metadata)
+    for problem in problems:
+        print(f"❌ {problem}")
+    checked = len(targets) + len(containers) + len(metadata)
+    if problems:
+        print(f"\n⚠️ {len(problems)} problems in {checked} entries")
+        return 1
+    print(f"✅ {len(targets)} icons, {len(containers)} containers and "
+          f"{len(metadata)} metadata entries match the manifest")
+    return 0
+
+def cmd_banner(args):
+    if args.batch:
+        variants = banner.load_variants(args.batch)
+        print(f"🌍 {len(variants)} banner variants -> {args.output_dir}/")
+        paths = banner.build_banners(variants, args.output_dir, profile=args.profile, jobs=args.jobs)
+    else:
+        variant = banner.Variant("en-US", "feature", banner.DEFAULT_STRINGS)
+        banner.save_banner(variant, BANNER_OUTPUT, args.profile)
+        variants, paths = [variant], [BANNER_OUTPUT]
+    if args.optimize:
+        for path in paths:
+            optimize_file(path, optimize_options(args))
+    for path in paths:
+        if os.path.getsize(path) > 1024 * 1024:
+            print(f"⚠️  Warning: {path} exceeds 1MB limit for Google Play Store")
+    print(f"📊 Created {len(paths)}/{len(variants)} banners")
+    return 0 if len(paths) == len(variants) else 1
+
+def cmd_bench(args):
+    from benchmark_icons import main as bench_main
+
+    bench_main(args.extra)
+    return 0
+
+def watched_files(args):
+    """Sources of the selected targets and containers, plus the manifest itself"""
+    targets, containers, _ = select(args)
+    names = {target.source for target in targets} | {container.source for container in containers}
+    return sorted(manifest.source_path(name) for name in names) + [manifest.DEFAULT_MANIFEST]
+
+def warm_up(args):
+    """Import the backends the renders need before the first change arrives"""
+    backends.optional("pillow")
+    if any(path.lower().endswith('.svg') for path in watched_files(args)):
+        try:
+            operations.select("rasterize")
+        except backends.BackendUnavailable as e:
+            print(f"⚠️  {e}")
+
+def cmd_watch(args):
+    # One cache for the session; stale checks then need no manifest reload
+    cache = BuildCache()
+
+    def rebuild(changed_paths):
+        if manifest.DEFAULT_MANIFEST in changed_paths:
+            manifest.load_manifest.cache_clear()
+        # Renders of changed sources would never be hit again
+        engine.clear()
+        try:
+            targets, containers, metadata = select(args)
+            engine.build(targets, cache, jobs=args.jobs, profile=args.profile,
+                         optimize=optimize_options(args), containers=containers, metadata=metadata)
+        except Exception as e:
+            print(f"❌ Rebuild failed: {e}")
+
+    print("🔄 Bringing icons up to date...")
+    rebuild(())
+    warm_up(args)
+    watch.watch(lambda: watched_files(args), rebuild, interval=args.interval)
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="icons", description="REChain VC Lab icon pipeline")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="render stale icons, containers and metadata")
+    add_selection_arguments(build)
+    add_jobs_argument(build)
+    add_force_argument(build)
+    add_profile_argument(build)
+    add_optimize_arguments(build)
+    trace.add_trace_argument(build)
+    build.add_argument('--dry-run', action='store_true', help='print the plan instead of building')
+    build.add_argument('--banners', nargs='?', const=banner.DEFAULT_VARIANTS, metavar='TABLE',
+                       help='also render every banner variant in the same run')
+    build.add_argument('--banner-dir', default='banners', help='output directory for --banners')
+    build.set_defaults(func=cmd_build)
+
+    plan = commands.add_parser("plan", help="print the render graph and expected work")
+    add_selection_arguments(plan)
+    add_profile_argument(plan)
+    add_optimize_arguments(plan)
+    plan.set_defaults(func=cmd_plan)
+
+    check = commands.add_parser("verify", help="check generated files against the manifest")
+    add_selection_arguments(check)
+    check.set_defaults(func=cmd_verify)
+
+    store = commands.add_parser("banner", help="render the Google Play banner")
+    store.add_argument('--batch', nargs='?', const=banner.DEFAULT_VARIANTS, metavar='TABLE',
+                       help='render every variant of a banner table')
+    store.add_argument('--output-dir', default='banners', help='output directory for --batch')
+    add_jobs_argument(store)
+    add_profile_argument(store)
+    add_optimize_arguments(store)
+    trace.add_trace_argument(store)
+    # Store submissions default to the smallest encoding
+    store.set_defaults(func=cmd_banner, profile="smallest")
+
+    live = commands.add_parser("watch", help="rebuild affected icons whenever a source changes")
+    add_selection_arguments(live)
+    add_jobs_argument(live)
+    add_profile_argument(live)
+    add_optimize_arguments(live)
+    live.add_argument('--interval', type=float, default=watch.DEFAULT_INTERVAL,
+                      help=f'seconds between checks (default: {watch.DEFAULT_INTERVAL})')
+    # Serial by default: renders stay in this process, so its caches stay warm
+    live.set_defaults(func=cmd_watch, jobs=1)
+
+    # Options after "bench" belong to benchmark_icons.py
+    bench = commands.add_parser("bench", help="run the benchmark suite", add_help=False)
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.func is not cmd_bench:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.extra = extra
+    trace.start(args)
+    status = args.func(args)
+    trace.finish(args)
+    sys.exit(status)
+
+if __name__ == "__main__":
+    profiling.run(main)
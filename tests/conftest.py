@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The pipeline and the generator scripts are imported from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
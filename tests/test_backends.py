@@ -0,0 +1,23 @@
+import importlib
+
+import pytest
+
+from icon_pipeline import backends
+
+
+def test_failed_backend_import_is_not_retried(monkeypatch):
+    monkeypatch.setitem(backends.BACKENDS, "ghost", ("icon_pipeline_no_such_module", "ghost"))
+    monkeypatch.delitem(backends._missing, "ghost", raising=False)
+    imports = []
+    real_import = importlib.import_module
+
+    def import_module(name, *args):
+        imports.append(name)
+        return real_import(name, *args)
+
+    monkeypatch.setattr(importlib, "import_module", import_module)
+    for _ in range(3):
+        with pytest.raises(backends.BackendUnavailable):
+            backends.load("ghost")
+    assert imports == ["icon_pipeline_no_such_module"]
+    monkeypatch.delitem(backends._missing, "ghost")
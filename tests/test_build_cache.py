@@ -0,0 +1,105 @@
+import os
+
+from icon_pipeline.build_cache import BuildCache, run_cached
+
+
+def _write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+    return str(path)
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def render(source, output):
+    """Stand-in for a render task: copies the source to the output"""
+    with open(source, 'rb') as f:
+        _write(output, f.read())
+    return True
+
+
+def fail(output):
+    """Stand-in for a render task that reports failure"""
+    return False
+
+
+def _build(cache, source, output):
+    key = cache.key(source=cache.source_digest(source), size=16)
+    return run_cached(render, [(output, key, (source, output))], cache, jobs=1)
+
+
+def test_unchanged_source_is_a_cache_hit(tmp_path):
+    manifest_path = str(tmp_path / "cache.json")
+    source = _write(tmp_path / "logo.png", b"v1")
+    output = str(tmp_path / "icon.png")
+
+    assert _build(BuildCache(manifest_path), source, output) == (1, 0, 0)
+    # A fresh BuildCache reads the manifest written by the first run
+    assert _build(BuildCache(manifest_path), source, output) == (0, 1, 0)
+
+
+def test_touched_source_with_same_bytes_stays_fresh(tmp_path):
+    manifest_path = str(tmp_path / "cache.json")
+    source = _write(tmp_path / "logo.png", b"v1")
+    output = str(tmp_path / "icon.png")
+    _build(BuildCache(manifest_path), source, output)
+
+    _bump_mtime(source)
+    assert _build(BuildCache(manifest_path), source, output) == (0, 1, 0)
+
+
+def test_changed_source_is_a_cache_miss(tmp_path):
+    manifest_path = str(tmp_path / "cache.json")
+    source = _write(tmp_path / "logo.png", b"v1")
+    output = str(tmp_path / "icon.png")
+    cache = BuildCache(manifest_path)
+    _build(cache, source, output)
+
+    # Same size, new mtime: the digest memo must not return the old hash
+    _write(source, b"v2")
+    _bump_mtime(source)
+    assert _build(cache, source, output) == (1, 0, 0)
+    with open(output, 'rb') as f:
+        assert f.read() == b"v2"
+
+
+def test_modified_or_missing_output_is_rebuilt(tmp_path):
+    manifest_path = str(tmp_path / "cache.json")
+    source = _write(tmp_path / "logo.png", b"v1")
+    output = str(tmp_path / "icon.png")
+    _build(BuildCache(manifest_path), source, output)
+
+    _write(output, b"edited by hand")
+    assert _build(BuildCache(manifest_path), source, output) == (1, 0, 0)
+    os.remove(output)
+    assert _build(BuildCache(manifest_path), source, output) == (1, 0, 0)
+
+
+def test_force_and_version_mismatch_rebuild(tmp_path):
+    manifest_path = str(tmp_path / "cache.json")
+    source = _write(tmp_path / "logo.png", b"v1")
+    output = str(tmp_path / "icon.png")
+    _build(BuildCache(manifest_path), source, output)
+
+    assert _build(BuildCache(manifest_path, force=True), source, output) == (1, 0, 0)
+    _write(manifest_path, b'{"version": -1, "entries": {}}')
+    assert _build(BuildCache(manifest_path), source, output) == (1, 0, 0)
+
+
+def test_failed_tasks_are_not_recorded(tmp_path):
+    cache = BuildCache(str(tmp_path / "cache.json"))
+    output = str(tmp_path / "icon.png")
+    key = cache.key(size=16)
+    assert run_cached(fail, [(output, key, (output,))], cache, jobs=1) == (0, 0, 1)
+    assert not cache.is_fresh(output, key)
+
+
+def test_key_depends_on_every_parameter():
+    cache = BuildCache(os.devnull)
+    base = cache.key(source="abc", size=16, treatment={"padding": 0.0})
+    assert base == cache.key(treatment={"padding": 0.0}, size=16, source="abc")
+    assert base != cache.key(source="abc", size=32, treatment={"padding": 0.0})
+    assert base != cache.key(source="abc", size=16, treatment={"padding": 0.125})
@@ -0,0 +1,95 @@
+import io
+import struct
+
+import pytest
+from PIL import Image
+
+from icon_pipeline import containers, manifest, verify
+
+
+def _images(sizes):
+    images = {}
+    for size in sizes:
+        img = Image.linear_gradient('L').resize((size, size))
+        images[size] = Image.merge('RGBA', (img, img.rotate(90), img.rotate(180), img.rotate(270)))
+    return images
+
+
+def _ico_entries(data):
+    reserved, kind, count = struct.unpack_from('<HHH', data)
+    assert (reserved, kind) == (0, 1)
+    entries = []
+    for index in range(count):
+        width, height, _, _, planes, bits, length, offset = struct.unpack_from(
+            '<BBBBHHII', data, 6 + 16 * index)
+        assert (planes, bits) == (1, 32)
+        assert offset + length <= len(data)
+        entries.append((width or 256, height or 256, data[offset:offset + length]))
+    return entries
+
+
+def _icns_entries(data):
+    assert data[:4] == b'icns'
+    assert struct.unpack_from('>I', data, 4)[0] == len(data)
+    entries = []
+    offset = 8
+    while offset < len(data):
+        icon_type, length = struct.unpack_from('>4sI', data, offset)
+        entries.append((icon_type, data[offset + 8:offset + length]))
+        offset += length
+    assert offset == len(data)
+    return entries
+
+
+def test_ico_entries():
+    images = _images(containers.ICO_SIZES)
+    entries = _ico_entries(containers.ico_bytes(images))
+
+    assert [(width, height) for width, height, _ in entries] == [(s, s) for s in containers.ICO_SIZES]
+    for width, _, payload in entries:
+        is_png = payload.startswith(b'\x89PNG')
+        assert is_png == (width >= containers.ICO_PNG_MIN_SIZE)
+        if is_png:
+            assert Image.open(io.BytesIO(payload)).convert('RGBA').tobytes() == images[width].tobytes()
+        else:
+            header_size, dib_width, dib_height = struct.unpack_from('<Iii', payload)
+            assert (header_size, dib_width, dib_height) == (40, width, width * 2)
+
+
+def test_ico_pixels_survive_pillow_decode():
+    images = _images((16, 32, 256))
+    ico = Image.open(io.BytesIO(containers.ico_bytes(images)))
+    for size, img in images.items():
+        assert ico.ico.getimage((size, size)).convert('RGBA').tobytes() == img.tobytes()
+
+
+def test_icns_entries():
+    images = _images(containers.ICNS_SIZES)
+    entries = _icns_entries(containers.icns_bytes(images))
+
+    expected = [icon_type for size in sorted(images) for icon_type in containers.ICNS_TYPES[size]]
+    assert [icon_type for icon_type, _ in entries] == expected
+    by_type = {icon_type: size for size, types in containers.ICNS_TYPES.items() for icon_type in types}
+    for icon_type, payload in entries:
+        img = Image.open(io.BytesIO(payload))
+        assert img.size == (by_type[icon_type],) * 2
+        assert img.convert('RGBA').tobytes() == images[by_type[icon_type]].tobytes()
+
+
+def test_icns_rejects_unsupported_sizes():
+    with pytest.raises(ValueError):
+        containers.icns_bytes(_images((48,)))
+
+
+@pytest.mark.parametrize("container_format, sizes", [
+    ("ico", (16, 32, 48, 256)),
+    ("icns", (16, 32, 128, 1024)),
+])
+def test_written_containers_pass_verify(tmp_path, container_format, sizes):
+    path = str(tmp_path / f"icon.{container_format}")
+    containers.write_container(path, container_format, _images(sizes))
+    container = manifest.Container("test", path, container_format, sizes, "svg", "plain")
+    assert verify.check_container(container) == []
+
+    wrong = container._replace(sizes=sizes[:-1])
+    assert verify.check_container(wrong)
@@ -0,0 +1,23 @@
+import os
+
+from icon_pipeline import engine, platform_metadata
+from icon_pipeline.build_cache import BuildCache
+
+ADAPTIVE = {"platform": "android", "format": "adaptive_icon", "res": "res", "name": "ic_launcher",
+            "background": "#FFFFFF", "inset": "16%", "densities": {"mdpi": 108, "hdpi": 162}}
+
+
+def test_metadata_waits_for_the_bitmaps_it_references(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = BuildCache(str(tmp_path / "cache.json"))
+
+    assert engine.build([], cache, metadata=[ADAPTIVE]) == (0, 0, 2)
+    for path in platform_metadata.files(ADAPTIVE):
+        assert not os.path.exists(path)
+
+    for path in platform_metadata.bitmaps(ADAPTIVE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+    assert engine.build([], cache, metadata=[ADAPTIVE]) == (0, 0, 0)
+    for path in platform_metadata.files(ADAPTIVE):
+        assert os.path.exists(path)
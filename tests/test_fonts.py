@@ -0,0 +1,78 @@
+import os
+import struct
+
+import pytest
+
+from icon_pipeline import fonts
+
+
+def _font_bytes(family, style):
+    """Smallest sfnt the index can read: a table directory and a name table"""
+    strings = [family.encode("utf-16-be"), style.encode("utf-16-be")]
+    records = b""
+    offset = 0
+    for name_id, data in zip((1, 2), strings):
+        records += struct.pack(">HHHHHH", 3, 1, 0x409, name_id, len(data), offset)
+        offset += len(data)
+    name = struct.pack(">HHH", 0, len(strings), 6 + len(records)) + records + b"".join(strings)
+    header = struct.pack(">IHHHH", 0x00010000, 1, 16, 0, 0)
+    directory = struct.pack(">4sIII", b"name", 0, 12 + 16, len(name))
+    return header + directory + name
+
+
+def _install(directory, faces):
+    for file_name, family, style in faces:
+        with open(os.path.join(directory, file_name), "wb") as f:
+            f.write(_font_bytes(family, style))
+    return fonts.FontIndex([str(directory)])
+
+
+def test_name_table_is_parsed(tmp_path):
+    _install(tmp_path, [("Test.ttf", "Test Sans", "Bold Italic")])
+    assert fonts.read_font_names(str(tmp_path / "Test.ttf")) == ("Test Sans", "Bold Italic")
+
+
+def test_book_face_is_regular(tmp_path):
+    # DejaVu's layout: "Book" is the regular face, and "-Bold" sorts first
+    index = _install(tmp_path, [
+        ("DejaVuSans-Bold.ttf", "DejaVu Sans", "Bold"),
+        ("DejaVuSans.ttf", "DejaVu Sans", "Book"),
+    ])
+    assert index.find("DejaVu Sans") == str(tmp_path / "DejaVuSans.ttf")
+    assert index.find("DejaVu Sans", "Regular") == str(tmp_path / "DejaVuSans.ttf")
+    assert index.find("DejaVu Sans", "Bold") == str(tmp_path / "DejaVuSans-Bold.ttf")
+    # Arial is not installed; its fallback keeps the regular weight
+    assert index.resolve("Arial") == str(tmp_path / "DejaVuSans.ttf")
+
+
+def test_missing_style_prefers_a_plain_face(tmp_path):
+    index = _install(tmp_path, [
+        ("A-Bold.ttf", "Family A", "Bold"),
+        ("A-BoldItalic.ttf", "Family A", "Bold Italic"),
+        ("A-Light.ttf", "Family A", "Light"),
+    ])
+    assert index.find("Family A") == str(tmp_path / "A-Light.ttf")
+
+
+def test_missing_style_without_plain_face_uses_any(tmp_path):
+    index = _install(tmp_path, [("B-Bold.ttf", "Family B", "Bold")])
+    assert index.find("Family B", "Italic") == str(tmp_path / "B-Bold.ttf")
+
+
+def test_lookup_by_file_name_and_unknown_family(tmp_path):
+    index = _install(tmp_path, [("Arial.ttf", "Arial", "Regular")])
+    assert index.find("arial.ttf") == str(tmp_path / "Arial.ttf")
+    assert index.find("Nope Sans") is None
+
+
+@pytest.mark.parametrize("style, key", [
+    ("Regular", "regular"),
+    ("Book", "regular"),
+    ("Roman", "regular"),
+    ("Normal", "regular"),
+    ("Bold", "bold"),
+    ("Bold  Oblique", "bold italic"),
+    ("Italic", "italic"),
+])
+def test_style_key(style, key):
+    assert fonts.style_key(style) == key
@@ -0,0 +1,91 @@
+import pytest
+
+from icon_pipeline import backends, operations
+
+
+@pytest.fixture(autouse=True)
+def fresh_process(monkeypatch):
+    """No forced backends, no recorded decisions, nothing settled yet"""
+    for operation in operations.OPERATIONS:
+        monkeypatch.delenv(f"ICON_BACKEND_{operation.upper()}", raising=False)
+    operations.reset()
+    yield
+    operations.reset()
+
+
+def _counting_benchmark(monkeypatch, timings):
+    calls = []
+
+    def benchmark(operation, repeat=operations.BENCHMARK_REPEAT, errors=None):
+        calls.append(operation)
+        for name, seconds in timings.items():
+            if seconds is None and errors is not None:
+                errors[name] = OSError(f"{name} failed to load")
+        return dict(timings)
+
+    monkeypatch.setattr(operations, "benchmark", benchmark)
+    return calls
+
+
+def test_unavailable_operation_is_settled_once(monkeypatch, tmp_path):
+    monkeypatch.setattr(operations, "available", lambda operation: list(operations.OPERATIONS[operation]))
+    calls = _counting_benchmark(monkeypatch, {"cairosvg": None})
+    path = str(tmp_path / "backends.json")
+    for _ in range(3):
+        with pytest.raises(backends.BackendUnavailable, match="cairosvg failed to load"):
+            operations.select("rasterize", path)
+    # Other processes read the recorded failure instead of measuring again
+    operations.reset()
+    with pytest.raises(backends.BackendUnavailable, match="cairosvg failed to load"):
+        operations.select("rasterize", path)
+    assert operations.method("rasterize", path) is None
+    assert calls == ["rasterize"]
+
+
+def test_decision_is_recorded_and_reused(monkeypatch, tmp_path):
+    calls = _counting_benchmark(monkeypatch, {"pyramid": 0.2, "pillow": 0.1})
+    path = str(tmp_path / "backends.json")
+    assert operations.select("resize", path).name == "pillow"
+    operations.reset()
+    assert operations.select("resize", path).name == "pillow"
+    assert calls == ["resize"]
+
+
+def test_unsaved_decision_lasts_for_the_process(monkeypatch, tmp_path):
+    calls = _counting_benchmark(monkeypatch, {"pillow": 0.2, "python": 0.1})
+
+    def read_only(path, decisions):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(operations, "_save_decisions", read_only)
+    path = str(tmp_path / "backends.json")
+    for _ in range(3):
+        assert operations.select("encode", path).name == "python"
+    assert calls == ["encode"]
+
+
+def test_forced_backend_skips_the_benchmark(monkeypatch, tmp_path):
+    calls = _counting_benchmark(monkeypatch, {})
+    monkeypatch.setenv("ICON_BACKEND_ENCODE", "python")
+    assert operations.select("encode", str(tmp_path / "backends.json")).name == "python"
+    assert calls == []
+
+
+def test_python_encoder_needs_no_backend(monkeypatch, tmp_path):
+    assert operations._by_name("encode", "python").requires == ()
+    # Without Pillow it is the only choice, taken without a benchmark
+    calls = _counting_benchmark(monkeypatch, {})
+    monkeypatch.setattr(backends, "installed", lambda name: False)
+    assert operations.select("encode", str(tmp_path / "backends.json")).name == "python"
+    assert calls == []
+
+
+def test_cache_key_method_never_benchmarks(monkeypatch, tmp_path):
+    calls = _counting_benchmark(monkeypatch, {"pillow": 0.2, "python": 0.1})
+    path = str(tmp_path / "backends.json")
+    assert operations.method("encode", path) == "pillow"
+    assert calls == []
+    # Once settled, the key follows the implementation in use
+    operations.select("encode", path)
+    assert operations.method("encode", path) == "png_encoder"
+
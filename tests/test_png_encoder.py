@@ -0,0 +1,90 @@
+import io
+import random
+import struct
+import zlib
+
+import pytest
+from PIL import Image
+
+from icon_pipeline import png_encoder
+from icon_pipeline.png_filters import FILTER_TYPES
+
+
+def _gradient(mode, width=37, height=23):
+    channels = len(mode)
+    return bytes((x * 7 + y * 13 + c * 51) % 256
+                 for y in range(height) for x in range(width) for c in range(channels))
+
+
+def _rows(data, row_size):
+    return [data[offset:offset + row_size] for offset in range(0, len(data), row_size)]
+
+
+def _decode(png):
+    img = Image.open(io.BytesIO(png))
+    img.load()
+    return img
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA"])
+@pytest.mark.parametrize("filter_name", sorted(FILTER_TYPES) + ["adaptive"])
+def test_round_trip_matches_pillow(mode, filter_name):
+    width, height = 37, 23
+    data = _gradient(mode, width, height)
+    options = png_encoder.EncoderOptions(filter_name, 6, zlib.Z_DEFAULT_STRATEGY)
+    png = png_encoder.encode_png(width, height, _rows(data, width * len(mode)), mode, options)
+
+    img = _decode(png)
+    assert img.mode == mode
+    assert img.size == (width, height)
+    assert img.tobytes() == data
+
+
+@pytest.mark.parametrize("profile", sorted(png_encoder.PROFILES))
+def test_profiles_round_trip(profile):
+    data = _gradient("RGBA")
+    png = png_encoder.encode_png(37, 23, _rows(data, 37 * 4), "RGBA", profile)
+    assert _decode(png).tobytes() == data
+
+
+def test_idat_is_split_into_fixed_size_chunks():
+    # Noise does not compress, so the stream spans several chunks
+    data = random.Random(0).randbytes(128 * 128 * 3)
+    png = png_encoder.encode_png(128, 128, _rows(data, 128 * 3), "RGB", "fast")
+
+    offset = len(png_encoder.PNG_SIGNATURE)
+    idat_sizes = []
+    while offset < len(png):
+        length, tag = struct.unpack_from('>I4s', png, offset)
+        if tag == b'IDAT':
+            idat_sizes.append(length)
+        offset += 12 + length
+    assert len(idat_sizes) > 1
+    assert all(size == png_encoder.IDAT_CHUNK_SIZE for size in idat_sizes[:-1])
+    assert _decode(png).tobytes() == data
+
+
+@pytest.mark.parametrize("color", [(99, 102, 241), (99, 102, 241, 128)])
+@pytest.mark.parametrize("profile", sorted(png_encoder.PROFILES))
+def test_solid_fill_round_trip(color, profile, monkeypatch):
+    # Small blocks, so the repeated-pattern path runs on a small image
+    monkeypatch.setattr(png_encoder, "SOLID_BLOCK_SIZE", 1024)
+    png = png_encoder.encode_solid(40, 300, color, profile)
+    img = _decode(png)
+    assert img.size == (40, 300)
+    assert img.tobytes() == bytes(color) * 40 * 300
+
+
+def test_row_count_and_length_are_checked():
+    with pytest.raises(ValueError):
+        png_encoder.encode_png(2, 2, [bytes(6)], "RGB")
+    with pytest.raises(ValueError):
+        png_encoder.encode_png(2, 2, [bytes(6), bytes(5)], "RGB")
+    with pytest.raises(ValueError):
+        png_encoder.encode_png(2, 2, [bytes(2)] * 2, "L")
+
+
+def test_pillow_options_map_back_to_profiles():
+    for profile in png_encoder.PROFILES:
+        options = png_encoder.options_from_pillow(png_encoder.pillow_save_options(profile))
+        assert options.level == png_encoder.PROFILES[profile].level
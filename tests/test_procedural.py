@@ -0,0 +1,46 @@
+import pytest
+from PIL import Image, ImageDraw
+
+from icon_pipeline import operations
+from icon_pipeline.procedural import ProceduralRenderer
+
+
+def draw_disc(size, scale=1):
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    ImageDraw.Draw(img).ellipse([size // 8, size // 8, size - size // 8, size - size // 8],
+                                fill=(99, 102, 241, 255), outline=(255, 255, 255, 255), width=scale)
+    return img
+
+
+def test_master_is_drawn_once():
+    calls = []
+
+    def draw(size, scale=1):
+        calls.append((size, scale))
+        return draw_disc(size, scale)
+
+    renderer = ProceduralRenderer(draw, 128, supersample=4)
+    for size in (16, 48, 128):
+        assert renderer.render(size).size == (size, size)
+    assert calls == [(512, 4)]
+
+
+@pytest.mark.parametrize("size", [16, 48, 128])
+def test_level_resizes_like_render(size, monkeypatch):
+    monkeypatch.setenv("ICON_BACKEND_RESIZE", "pyramid")
+    operations.reset()
+    renderer = ProceduralRenderer(draw_disc, 128, supersample=4)
+    level = renderer.level(size)
+    assert level.width >= size
+    assert level.width < renderer.master.width or size == 128
+    from_level = level if level.size == (size, size) else operations.resize(level, (size, size))
+    assert from_level.tobytes() == renderer.render(size).tobytes()
+    operations.reset()
+
+
+def test_sizes_above_the_master_target_are_rejected():
+    renderer = ProceduralRenderer(draw_disc, 64)
+    with pytest.raises(ValueError):
+        renderer.level(128)
+    with pytest.raises(ValueError):
+        renderer.render(128)
@@ -0,0 +1,47 @@
+import os
+import sys
+
+from icon_pipeline import profiling
+
+
+def _run(monkeypatch, tmp_path, argv):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["icons.py"] + argv)
+    seen = []
+    profiling.run(lambda: seen.append(sys.argv[1:]))
+    return seen[0]
+
+
+def test_switch_does_not_take_the_subcommand_as_its_path(monkeypatch, tmp_path):
+    remaining = _run(monkeypatch, tmp_path, ["--cprofile", "build", "--dry-run"])
+    assert remaining == ["build", "--dry-run"]
+    assert sorted(os.listdir(tmp_path)) == ["icons.pstats"]
+
+
+def test_output_paths_enable_their_profiler(monkeypatch, tmp_path):
+    remaining = _run(monkeypatch, tmp_path, ["plan", "--cprofile-out", "out/run.pstats",
+                                             "--trace-alloc-out", "out/run.alloc.txt"])
+    assert remaining == ["plan"]
+    assert sorted(os.listdir(tmp_path / "out")) == ["run.alloc.txt", "run.pstats"]
+    assert not profiling.active()
+
+
+def test_without_options_main_runs_unprofiled(monkeypatch, tmp_path):
+    assert _run(monkeypatch, tmp_path, ["build", "--profile", "fast"]) == ["build", "--profile", "fast"]
+    assert os.listdir(tmp_path) == []
+
+
+def test_profile_size_limits_measured_blocks(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["icons.py", "--trace-alloc", "--profile-size", "48"])
+    measured = []
+
+    def main():
+        for size in (16, 48, 96):
+            with profiling.target(size):
+                measured.append((size, profiling._session.measured))
+
+    profiling.run(main)
+    assert measured == [(16, 0), (48, 1), (96, 1)]
+    with open(tmp_path / "icons.alloc.txt", encoding="utf-8") as f:
+        assert f.read().startswith("48x48:")
@@ -0,0 +1,51 @@
+import gc
+
+from PIL import Image, ImageDraw
+
+from icon_pipeline import resample
+
+
+def _image(size=512):
+    img = Image.linear_gradient('L').resize((size, size))
+    return Image.merge('RGBA', (img, img.rotate(90), img.rotate(180), img.rotate(270)))
+
+
+def _detailed(size=1024):
+    """Smooth gradients with thin outlines, like operations.benchmark_image"""
+    img = _image(size)
+    img.putalpha(255)
+    draw = ImageDraw.Draw(img)
+    for i in range(0, size, size // 16):
+        draw.ellipse([i // 2, i // 3, size - i // 3, size - i // 2], outline=(255, i % 256, 0, 160))
+    return img
+
+
+def test_levels_are_shared_between_targets():
+    img = _image()
+    resample.resize(img, (48, 48))
+    levels = list(resample.pyramid(img).levels)
+    resample.resize(img, (96, 96))
+    assert resample.pyramid(img).levels[:len(levels)] == levels
+
+
+def test_pyramids_are_freed_with_their_image():
+    before = len(resample._pyramids)
+    for _ in range(5):
+        img = _image()
+        resample.resize(img, (32, 32))
+        del img
+    gc.collect()
+    assert len(resample._pyramids) == before
+
+
+def test_pyramid_matches_direct_lanczos():
+    img = _detailed()
+    for size in (16, 48, 192, 256):
+        assert resample.quality_check(img, (size, size)) >= resample.MIN_PSNR
+
+
+def test_exact_level_is_copied():
+    img = _image(256)
+    result = resample.resize(img, (256, 256))
+    assert result is not img
+    assert result.tobytes() == img.tobytes()
@@ -0,0 +1,11 @@
+import importlib
+
+import pytest
+
+
+@pytest.mark.parametrize("script", ["create_icons_from_logo", "copy_logo_to_icons"])
+def test_logo_scripts_exit_nonzero_without_source(script, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit) as error:
+        importlib.import_module(script).main([])
+    assert error.value.code == 1
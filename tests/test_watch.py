@@ -0,0 +1,70 @@
+import os
+import threading
+import time
+
+from icon_pipeline import watch
+
+
+def _save(path, data):
+    with open(path, 'w') as f:
+        f.write(data)
+    # Distinct mtimes even on filesystems with coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def _watch_in_thread(paths, rebuild, max_rebuilds):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(
+        rebuilds=watch.watch(paths, rebuild, interval=0.01, max_rebuilds=max_rebuilds)), daemon=True)
+    thread.start()
+    time.sleep(0.1)
+    return thread, result
+
+
+def test_snapshot_and_changed(tmp_path):
+    path = str(tmp_path / "logo.svg")
+    missing = str(tmp_path / "missing.svg")
+    _save(path, "a")
+    before = watch.snapshot([path, missing])
+    assert before[missing] is None
+    _save(path, "b")
+    assert watch.changed(before, watch.snapshot([path, missing])) == [path]
+
+
+def test_save_during_rebuild_triggers_another_rebuild(tmp_path):
+    path = str(tmp_path / "logo.svg")
+    _save(path, "a")
+    calls = []
+
+    def rebuild(changed_paths):
+        calls.append(list(changed_paths))
+        if len(calls) == 1:
+            _save(path, "saved while rebuilding")
+
+    thread, result = _watch_in_thread([path], rebuild, max_rebuilds=2)
+    _save(path, "b")
+    thread.join(timeout=5)
+    assert result.get("rebuilds") == 2
+    assert calls == [[path], [path]]
+
+
+def test_new_paths_from_the_callable_are_watched(tmp_path):
+    first = str(tmp_path / "manifest.json")
+    second = str(tmp_path / "logo.png")
+    _save(first, "{}")
+    _save(second, "a")
+    paths = [first]
+    calls = []
+
+    def rebuild(changed_paths):
+        calls.append(list(changed_paths))
+        paths.append(second)
+
+    thread, result = _watch_in_thread(lambda: list(paths), rebuild, max_rebuilds=2)
+    _save(first, '{"sources": {}}')
+    time.sleep(0.2)
+    _save(second, "b")
+    thread.join(timeout=5)
+    assert result.get("rebuilds") == 2
+    assert calls == [[first], [second]]